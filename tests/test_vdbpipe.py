@@ -37,6 +37,12 @@ def pipeline():
     p.page_index = {}
     p._state_dir = tempfile.mkdtemp()
     p._intent_embeddings = {}   # disable semantic router → use keyword fallback
+    p._ingest_version = 0
+    p._pi_dump_cache = None
+    p._pi_dump_version = -1
+    p._graph_dump_cache = None
+    p._graph_dump_version = -1
+    p._query_batcher = None
 
     # Mocked providers
     p.embedder = MagicMock()
@@ -54,7 +60,7 @@ def pipeline():
 
     loader_mock = MagicMock()
     loader_mock.data_path = None
-    loader_mock.load_data.return_value = [
+    loader_mock.iter_data.return_value = [
         {"content": "Alice leads the API team. Bob is a researcher.", "source": "test.txt"}
     ]
     p.loader = loader_mock
@@ -77,6 +83,20 @@ class TestInitialization:
         assert hasattr(pipeline, "extract")
         assert hasattr(pipeline, "search")
 
+    def test_local_embedder_loaded_once_per_model(self):
+        from vectorDBpipe.pipeline import vdbpipe
+
+        with patch("vectorDBpipe.embeddings.embedder.Embedder") as embedder_cls, \
+                patch.dict(vdbpipe._EMBEDDER_CACHE, clear=True):
+            embedder_cls.side_effect = lambda model_name: MagicMock(model_name=model_name)
+            first = vdbpipe._get_local_embedder("all-MiniLM-L6-v2")
+            second = vdbpipe._get_local_embedder("all-MiniLM-L6-v2")
+            other = vdbpipe._get_local_embedder("all-mpnet-base-v2")
+
+        assert first is second
+        assert other is not first
+        assert embedder_cls.call_count == 2
+
     def test_is_not_text_pipeline_subclass(self):
         """VDBpipe must be pure composition — NOT a subclass of TextPipeline."""
         from vectorDBpipe.pipeline.vdbpipe import VDBpipe
@@ -96,17 +116,49 @@ class TestInitialization:
 # ─────────────────────────────────────────────────────────────────────────────
 
 class TestIngestion:
-    def test_ingest_sets_loader_path_and_calls_load_data(self, pipeline):
+    def test_ingest_sets_loader_path_and_streams_documents(self, pipeline):
         pipeline.ingest("dummy_path/report.pdf")
         assert pipeline.loader.data_path == "dummy_path/report.pdf"
-        pipeline.loader.load_data.assert_called_once()
+        pipeline.loader.iter_data.assert_called_once()
 
     def test_ingest_populates_page_index(self, pipeline):
         pipeline.ingest("dummy_path")
         assert len(pipeline.page_index) > 0
 
+    def test_ingest_without_llm_builds_page_index_inline(self, pipeline):
+        pipeline.llm = None
+        pipeline.ingest("dummy_path")
+        assert "test.txt" in pipeline.page_index
+
+    def test_fast_pageindex_detects_headings(self, pipeline):
+        pipeline._fast_pageindex("doc.md", "# Intro\nsome body text\nRESULTS 2024\nmore text")
+        assert pipeline.page_index["doc.md"]["chapters"] == ["# Intro", "RESULTS 2024"]
+
+    def test_ingest_propagates_loader_errors(self, pipeline):
+        def failing_loader():
+            yield {"content": "First doc.", "source": "a.txt"}
+            raise FileNotFoundError("missing")
+
+        pipeline.loader.iter_data.side_effect = failing_loader
+        with pytest.raises(FileNotFoundError):
+            pipeline.ingest("dummy_path")
+
+    def test_ingest_deduplicates_identical_chunks(self, pipeline):
+        pipeline.loader.iter_data.return_value = [
+            {"content": "Same text in both files.", "source": "a.txt"},
+            {"content": "Same text in both files.", "source": "b.txt"},
+        ]
+        assert pipeline.ingest("dummy_path") == 1
+
+    def test_ingest_writes_batches_through_store_writer(self, pipeline):
+        del pipeline._embed_and_store  # use the real embed → writer-thread path
+        assert pipeline.ingest("dummy_path") == 1
+        pipeline.vector_store.add.assert_called_once()
+        assert pipeline.vector_store.add.call_args.kwargs["metadata"] == [{"source": "test.txt"}]
+        pipeline.vector_store.flush.assert_called_once()
+
     def test_ingest_skips_empty_documents(self, pipeline):
-        pipeline.loader.load_data.return_value = [{"content": "", "source": "empty.txt"}]
+        pipeline.loader.iter_data.return_value = [{"content": "", "source": "empty.txt"}]
         result = pipeline.ingest("dummy_path")
         assert result == 0  # nothing was embedded
 
@@ -217,6 +269,26 @@ class TestEngine3GraphRAG:
         assert "Alice" in result
 
 
+class TestQueryDumpCache:
+    def test_page_index_dump_reused_until_next_ingest(self, pipeline):
+        pipeline.page_index = {"a.txt": {"summary": "First.", "chapters": []}}
+        first = pipeline._page_index_dump()
+        assert pipeline._page_index_dump() is first
+
+        pipeline._extract_structure_and_graph("b.txt", "Second document text.")
+        refreshed = pipeline._page_index_dump()
+        assert refreshed is not first
+        assert "b.txt" in refreshed
+
+    def test_graph_dump_invalidated_by_extraction(self, pipeline):
+        pipeline.llm = None
+        pipeline.graph.add_edge("Alice", "API Team", relation="leads")
+        assert len(pipeline._graph_edge_dump()) == 1
+
+        pipeline._extract_structure_and_graph("c.txt", "Bob has Research Budget.")
+        assert len(pipeline._graph_edge_dump()) == 2
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # #7 — Engine 4: Structured Extract
 # ─────────────────────────────────────────────────────────────────────────────
@@ -267,6 +339,59 @@ class TestNoLLMFallbacks:
 # #9 — Sentence-Boundary Chunking
 # ─────────────────────────────────────────────────────────────────────────────
 
+class TestPrepareChunks:
+    def test_matches_clean_then_chunk(self):
+        from vectorDBpipe.utils.common import prepare_chunks, clean_text, chunk_text
+        text = "Caf\u00e9  au\nlait \u2014 " + " ".join(f"w{i}" for i in range(1200))
+        prepared = prepare_chunks(text, 512)
+        assert [c for c, _ in prepared] == chunk_text(clean_text(text), 512)
+
+    def test_digest_is_stable_per_chunk(self):
+        from vectorDBpipe.utils.common import prepare_chunks
+        (c1, d1), = prepare_chunks("alpha beta")
+        (c2, d2), = prepare_chunks("alpha   beta")
+        assert c1 == c2 and d1 == d2 and len(d1) == 16
+
+
+class TestContentDigest:
+    def test_stable_and_sized(self):
+        from vectorDBpipe.utils.common import content_digest
+        assert content_digest("caf\u00e9") == content_digest("caf\u00e9")
+        assert content_digest("a") != content_digest("b")
+        assert len(content_digest("a", 8)) == 8
+
+
+class TestCleanText:
+    def test_collapses_whitespace_and_drops_non_ascii(self):
+        from vectorDBpipe.utils.common import clean_text
+        assert clean_text("  Hello\n\t world  ") == "Hello world"
+        assert clean_text("caf\u00e9 \u2014 bar") == "caf bar"
+
+
+class TestChunkText:
+    def test_cleaned_and_raw_text_chunk_identically(self):
+        from vectorDBpipe.utils.common import chunk_text
+        words = [f"w{i}" for i in range(23)]
+        expected = [" ".join(words[i:i + 5]) for i in range(0, 23, 3)]
+        assert chunk_text(" ".join(words), chunk_size=5, overlap=2) == expected
+        assert chunk_text("\n  ".join(words) + " ", chunk_size=5, overlap=2) == expected
+
+
+class TestListFilesInDir:
+    def test_recursive_case_insensitive_extension_filter(self, tmp_path):
+        from vectorDBpipe.utils.common import list_files_in_dir
+        (tmp_path / "sub" / "deeper").mkdir(parents=True)
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "sub" / "B.PDF").write_text("b")
+        (tmp_path / "sub" / "deeper" / "c.md").write_text("c")
+        (tmp_path / "dir.txt").mkdir()
+
+        found = list_files_in_dir(str(tmp_path), extensions=[".txt", ".pdf"])
+        assert sorted(os.path.relpath(f, tmp_path) for f in found) == ["a.txt", os.path.join("sub", "B.PDF")]
+        assert len(list_files_in_dir(str(tmp_path))) == 3
+        assert list_files_in_dir(str(tmp_path / "missing")) == []
+
+
 class TestSentenceChunking:
     def test_basic_sentence_split(self):
         from vectorDBpipe.utils.common import chunk_text_sentences
@@ -389,7 +514,47 @@ class TestPersistence:
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# #12 — Streaming
+# #12 — Query Batching
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestQueryBatcher:
+    def test_concurrent_searches_share_one_batch(self, pipeline):
+        import threading
+        from vectorDBpipe.pipeline.query_batcher import QueryBatcher
+
+        pipeline.embedder.embed_batch.side_effect = lambda qs: [[float(len(q))] for q in qs]
+        pipeline.vector_store.search_batch.side_effect = lambda vecs, top_k: [
+            [{"document": f"hit-{v[0]:.0f}-{i}"} for i in range(top_k)] for v in vecs
+        ]
+        pipeline._query_batcher = QueryBatcher(
+            pipeline.embedder, pipeline.vector_store, max_batch_size=4, max_wait_ms=200
+        )
+
+        results = {}
+        threads = [
+            threading.Thread(target=lambda q=q: results.__setitem__(q, pipeline.search(q, top_k=2)))
+            for q in ["a", "bb", "ccc", "dddd"]
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        pipeline._query_batcher.close()
+
+        assert pipeline.embedder.embed_batch.call_count == 1
+        assert results["ccc"] == [{"document": "hit-3-0"}, {"document": "hit-3-1"}]
+
+    def test_batch_errors_propagate_to_search(self, pipeline):
+        from vectorDBpipe.pipeline.query_batcher import QueryBatcher
+
+        pipeline.embedder.embed_batch.side_effect = RuntimeError("model offline")
+        pipeline._query_batcher = QueryBatcher(pipeline.embedder, pipeline.vector_store, max_wait_ms=0)
+        assert pipeline.search("anything") == []
+        pipeline._query_batcher.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# #13 — Streaming
 # ─────────────────────────────────────────────────────────────────────────────
 
 class TestStreaming:
@@ -3,7 +3,7 @@ import json
 import csv
 import urllib.parse
 from pathlib import Path
-from typing import List, Dict, Union, Any
+from typing import List, Dict, Union, Any, Iterator
 from bs4 import BeautifulSoup
 import docx2txt
 import fitz  # PyMuPDF
@@ -50,45 +50,57 @@ class DataLoader:
         Primary loader used by pipeline/tests. Routes data to correct integration logic.
         Returns list of dicts with {'source', 'content'}.
         """
+        return list(self.iter_data())
+
+    def iter_data(self) -> Iterator[Dict]:
+        """
+        Streaming variant of load_data(): yields {'source', 'content'} dicts one
+        document at a time, so directory ingestion never holds the whole corpus
+        in memory.
+        """
         if not self.data_path:
             raise ValueError("Data path not provided to DataLoader.")
 
         # Check if it's an S3 link
         if self.data_path.startswith("s3://"):
-            return self._load_s3(self.data_path)
+            yield from self._load_s3(self.data_path)
+            return
         
         # Check if it's a URL
         if self.data_path.startswith("http://") or self.data_path.startswith("https://"):
-            return self._load_web_url(self.data_path)
+            yield from self._load_web_url(self.data_path)
+            return
 
         # Check SaaS/Custom connectors
-        if self.data_path.startswith("notion://"): return self._load_notion(self.data_path)
-        if self.data_path.startswith("confluence://"): return self._load_confluence(self.data_path)
-        if self.data_path.startswith("slack://"): return self._load_slack(self.data_path)
-        if self.data_path.startswith("github://"): return self._load_github(self.data_path)
-        if self.data_path.startswith("jira://"): return self._load_jira(self.data_path)
-        if self.data_path.startswith("gdrive://"): return self._load_gdrive(self.data_path)
+        if self.data_path.startswith("notion://"): yield from self._load_notion(self.data_path); return
+        if self.data_path.startswith("confluence://"): yield from self._load_confluence(self.data_path); return
+        if self.data_path.startswith("slack://"): yield from self._load_slack(self.data_path); return
+        if self.data_path.startswith("github://"): yield from self._load_github(self.data_path); return
+        if self.data_path.startswith("jira://"): yield from self._load_jira(self.data_path); return
+        if self.data_path.startswith("gdrive://"): yield from self._load_gdrive(self.data_path); return
 
         path = Path(self.data_path)
         if path.is_file():
             content = self._load_by_ext(str(path))
-            return [{"source": str(path), "content": clean_text(content)}] if content else []
+            if content:
+                yield {"source": str(path), "content": clean_text(content)}
         elif path.is_dir():
-            return self.load_all_files(path)
+            yield from self.iter_all_files(path)
         else:
             raise FileNotFoundError(f"Data path does not exist: {self.data_path}")
 
     def load_all_files(self, path: Path) -> List[Dict]:
+        return list(self.iter_all_files(path))
+
+    def iter_all_files(self, path: Path) -> Iterator[Dict]:
         files = list_files_in_dir(str(path), extensions=self.supported_ext)
-        data = []
         for file_path in files:
             try:
                 content = self._load_by_ext(file_path)
                 if content:
-                    data.append({"source": file_path, "content": clean_text(content)})
+                    yield {"source": file_path, "content": clean_text(content)}
             except Exception as e:
                 print(f"[ERROR] Failed to load {file_path}: {e}")
-        return data
 
     def _load_by_ext(self, path: str) -> str:
         ext = Path(path).suffix.lower()
@@ -0,0 +1,84 @@
+# pipeline/query_batcher.py
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List
+
+
+class QueryBatcher:
+    """
+    Dynamic batching for concurrent semantic searches.
+
+    Queries submitted from any thread are collected by a background worker
+    and flushed when `max_batch_size` are pending or `max_wait_ms` has passed
+    since the first one arrived. Each flush makes one embed_batch() call and
+    one vector_store.search_batch() call for the whole group, so embedding
+    models run at a useful batch size instead of batch size 1.
+    """
+
+    def __init__(self, embedder, vector_store, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.embedder = embedder
+        self.vector_store = vector_store
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._pending: queue.Queue = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="vdbpipe-query-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, query: str, top_k: int = 5) -> Future:
+        """Queue a query; the returned Future resolves to its search results."""
+        if self._closed:
+            raise RuntimeError("QueryBatcher is closed.")
+        future: Future = Future()
+        self._pending.put((query, top_k, future))
+        return future
+
+    def close(self):
+        """Flush outstanding queries and stop the worker thread."""
+        if not self._closed:
+            self._closed = True
+            self._pending.put(None)
+            self._worker.join()
+
+    def _run(self):
+        while True:
+            first = self._pending.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: List[tuple]):
+        try:
+            vectors = self.embedder.embed_batch([query for query, _, _ in batch])
+            max_k = max(top_k for _, top_k, _ in batch)
+            results: List[List[Dict[str, Any]]] = self.vector_store.search_batch(vectors, top_k=max_k)
+            if len(results) != len(batch):
+                raise RuntimeError(f"search_batch returned {len(results)} result lists for {len(batch)} queries.")
+            for (_, top_k, future), hits in zip(batch, results):
+                future.set_result(hits[:top_k])
+        except Exception as e:
+            # No future may be left unresolved, or its search() call would block forever
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
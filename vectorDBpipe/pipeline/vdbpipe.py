@@ -1,16 +1,92 @@
 import os
+import re
 import json
-import networkx as nx
-from typing import List, Dict, Any, Optional
+import queue
+import threading
+import concurrent.futures
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 
 from vectorDBpipe.config.config_manager import ConfigManager
 from vectorDBpipe.data.loader import DataLoader
-from vectorDBpipe.utils.common import clean_text, chunk_text
+from vectorDBpipe.utils.common import clean_text, prepare_chunks
 from vectorDBpipe.logger.logging import setup_logger
 
-# LangChain structured output
-from langchain_core.prompts import ChatPromptTemplate
-from pydantic import create_model, BaseModel
+# Keyword-fallback routing: one alternation per engine so each query is
+# scanned once by the regex engine instead of once per keyword.
+_ENGINE2_RE = re.compile(
+    r"summarize|summary|overall tone|chapter|overview|gist|tldr|tl;dr"
+)
+_ENGINE3_RE = re.compile(
+    r"connected|relationship|how is|related to|links|connection|path from"
+)
+
+# PageIndex heading heuristic: a line starting with '#', or an all-caps line
+# (no lowercase letters, at least one uppercase letter).
+_HEADING_RE = re.compile(r"^[ \t]*(#[^\n]*|(?=[^a-z\n]*[A-Z])[^a-z\n]+)$", re.MULTILINE)
+
+# Loaded sentence-transformer models keyed by model name. Loading a model
+# dominates VDBpipe construction, and the models are read-only at inference
+# time, so every pipeline in the process shares one instance per model.
+_EMBEDDER_CACHE: Dict[str, Any] = {}
+_EMBEDDER_CACHE_LOCK = threading.Lock()
+
+
+def _get_local_embedder(model_name: str):
+    """Return the process-wide Embedder for `model_name`, loading it on first use."""
+    with _EMBEDDER_CACHE_LOCK:
+        embedder = _EMBEDDER_CACHE.get(model_name)
+        if embedder is None:
+            from vectorDBpipe.embeddings.embedder import Embedder
+            embedder = Embedder(model_name=model_name)
+            _EMBEDDER_CACHE[model_name] = embedder
+        return embedder
+
+
+def _prefetch(iterable: Iterable, maxsize: int = 64) -> Iterator:
+    """
+    Iterate `iterable` on a background thread, keeping at most `maxsize`
+    items buffered, so document I/O overlaps with chunking/embedding.
+    Exceptions raised by the producer are re-raised in the consumer.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    done = object()
+    errors: List[BaseException] = []
+
+    def _put(item) -> bool:
+        # Poll so the producer can notice an abandoned consumer instead of
+        # blocking forever on a full buffer.
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            for item in iterable:
+                if not _put(item):
+                    return
+        except BaseException as e:
+            errors.append(e)
+        _put(done)
+
+    producer = threading.Thread(target=_produce, name="vdbpipe-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+    producer.join()
+    if errors:
+        raise errors[0]
 
 
 class VDBpipe:
@@ -88,8 +164,7 @@ class VDBpipe:
 
         if embed_provider in ["local", "huggingface", ""]:
             try:
-                from vectorDBpipe.embeddings.embedder import Embedder
-                self.embedder = Embedder(model_name=embed_model)
+                self.embedder = _get_local_embedder(embed_model)
                 self.logger.info(f"Embedder initialized: {embed_model}")
             except Exception as e:
                 self.logger.warning(f"Embedder init failed: {e}")
@@ -101,22 +176,41 @@ class VDBpipe:
         collection = db_cfg.get("collection_name", "default_collection")
         mode = db_cfg.get("mode", "local")
         save_dir = self._state_dir
+        # Remaining keys (index_type, nlist, nprobe, dimension, ...) are
+        # provider-specific tuning options forwarded to the store as-is.
+        store_opts = {
+            k: v for k, v in db_cfg.items()
+            if k not in ("provider", "collection_name", "mode", "api_key", "save_dir")
+        }
 
         try:
             if db_provider == "faiss":
                 from vectorDBpipe.vectordb.faiss_client import FaissDatabase
                 self.vector_store = FaissDatabase(
-                    collection_name=collection, mode=mode, save_dir=save_dir
+                    collection_name=collection, mode=mode, save_dir=save_dir, **store_opts
                 )
             elif db_provider in ["chroma", "chromadb"]:
                 from vectorDBpipe.vectordb.chroma_client import ChromaDatabase
                 self.vector_store = ChromaDatabase(
-                    collection_name=collection, mode=mode, save_dir=save_dir
+                    collection_name=collection, mode=mode, save_dir=save_dir, **store_opts
                 )
             self.logger.info(f"Vector store initialized: {db_provider}")
         except Exception as e:
             self.logger.warning(f"Vector store init failed: {e}")
 
+        # ── 3b. Optional dynamic query batching for concurrent search() ─────
+        self._query_batcher = None
+        batch_cfg = cfg.get("query_batching") or {}
+        if batch_cfg.get("enabled") and self.embedder is not None and self.vector_store is not None:
+            from vectorDBpipe.pipeline.query_batcher import QueryBatcher
+            self._query_batcher = QueryBatcher(
+                self.embedder,
+                self.vector_store,
+                max_batch_size=batch_cfg.get("max_batch_size", 32),
+                max_wait_ms=batch_cfg.get("max_wait_ms", 5),
+            )
+            self.logger.info("Query batching enabled for search().")
+
         # ── 4. LLM Client ─────────────────────────────────────────────────────
         self.llm = None
         llm_cfg = cfg.get("llm") or {}
@@ -154,9 +248,18 @@ class VDBpipe:
                 self.logger.warning(f"LLM init failed: {e}")
 
         # ── 5. Omni-RAG State ─────────────────────────────────────────────────
+        import networkx as nx  # deferred: only needed once a pipeline is built
         self.graph = nx.DiGraph()
         self.page_index: Dict[str, Any] = {}
 
+        # Serialized views of graph/page_index reused across queries; rebuilt
+        # only when _ingest_version moves past the version they were built at.
+        self._ingest_version = 0
+        self._pi_dump_cache: Optional[str] = None
+        self._pi_dump_version = -1
+        self._graph_dump_cache: Optional[List[tuple]] = None
+        self._graph_dump_version = -1
+
         # ── 6. Semantic Router — pre-compute intent embeddings ─────────────────
         self._intent_embeddings: Dict[str, Any] = {}
         self._init_semantic_router()
@@ -234,12 +337,9 @@ class VDBpipe:
 
         # ── Keyword fallback (when embedder not available) ─────────────────
         q = query.lower()
-        summarize_kw = {"summarize", "summary", "overall tone", "chapter", "overview", "gist", "tldr", "tl;dr"}
-        graph_kw = {"connected", "relationship", "how is", "related to", "links", "connection", "path from"}
-
-        if any(kw in q for kw in summarize_kw):
+        if _ENGINE2_RE.search(q):
             return "ENGINE_2"
-        if any(kw in q for kw in graph_kw):
+        if _ENGINE3_RE.search(q):
             return "ENGINE_3"
         return "ENGINE_1"
 
@@ -253,6 +353,7 @@ class VDBpipe:
         to disk so they survive server restarts.
         """
         try:
+            import networkx as nx
             os.makedirs(save_dir, exist_ok=True)
             # Graph
             graph_path = os.path.join(save_dir, "graph_state.json")
@@ -279,6 +380,7 @@ class VDBpipe:
         try:
             graph_path = os.path.join(save_dir, "graph_state.json")
             if os.path.exists(graph_path):
+                import networkx as nx
                 with open(graph_path, "r", encoding="utf-8") as f:
                     graph_data = json.load(f)
                 self.graph = nx.node_link_graph(graph_data)
@@ -291,6 +393,7 @@ class VDBpipe:
                 with open(pi_path, "r", encoding="utf-8") as f:
                     self.page_index = json.load(f)
                 self.logger.info(f"Restored page_index from disk: {len(self.page_index)} documents")
+            self._ingest_version += 1
         except Exception as e:
             self.logger.warning(f"State restore failed (starting fresh): {e}")
 
@@ -298,57 +401,93 @@ class VDBpipe:
     # INGESTION — Tri-Processing
     # =========================================================================
 
-    def ingest(self, data_path: str, batch_size: int = 100):
+    def ingest(self, data_path: str, batch_size: int = 5000):
         """
         The Tri-Processing Ingestion Engine.
         Processes data into vectors (Phase 1), structural indexes (Phase 2),
         and a graph (Phase 3) — all in parallel via ThreadPoolExecutor.
         State is automatically persisted to disk after ingestion completes.
+
+        Chunks are flushed to the vector store `batch_size` at a time; large
+        batches mean fewer store transactions (one SQLite commit for Chroma,
+        one index append for FAISS) per ingest.
+
+        Documents are streamed from the loader (read ahead by a background
+        thread) so only a handful are resident at any time.
         """
         self.logger.info(f"Starting Omni-Ingestion for: {data_path}")
         self.loader.data_path = data_path
-        documents = self.loader.load_data()
-
-        if not documents:
-            self.logger.warning("No documents found to ingest.")
-            return 0
 
         chunk_batch, docs_batch, meta_batch = [], [], []
         total_chunks = 0
+        total_docs = 0
+        seen_digests = set()
+        src_meta_cache: Dict[str, Dict[str, Any]] = {}
+
+        # Vector-store writes run on a writer thread so the next batch can be
+        # embedded while the previous one is being stored.
+        write_queue: queue.Queue = queue.Queue(maxsize=2)
+        writer = threading.Thread(
+            target=self._store_worker, args=(write_queue,), name="vdbpipe-store-writer", daemon=True
+        )
+        writer.start()
 
-        import concurrent.futures
-
-        for doc in documents:
-            content, source = doc.get("content"), doc.get("source")
-            if not content:
-                continue
-
-            cleaned = clean_text(content)
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-                # Phase 1: Vector Chunking (always runs)
-                chunk_future = executor.submit(chunk_text, cleaned, 512)
-
-                # Phase 2 & 3: PageIndex + Graph Extraction
-                extraction_future = executor.submit(
-                    self._extract_structure_and_graph, source, cleaned[:2000]
-                )
-
-                chunks = chunk_future.result()
-                extraction_future.result()
-
-            chunk_batch.extend(chunks)
-            docs_batch.extend(chunks)
-            meta_batch.extend([{"source": source}] * len(chunks))
-
-            if len(chunk_batch) >= batch_size:
-                self._embed_and_store(chunk_batch, docs_batch, meta_batch)
+        try:
+            for doc in _prefetch(self.loader.iter_data()):
+                total_docs += 1
+                content, source = doc.get("content"), doc.get("source")
+                if not content:
+                    continue
+
+                sample = clean_text(content[:2000])
+
+                if self.llm is None:
+                    # Heuristic-only extraction is cheap — run it inline rather
+                    # than paying thread-pool and future overhead per document.
+                    prepared = prepare_chunks(content, 512)
+                    self._extract_structure_and_graph(source, sample)
+                else:
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+                        # Phase 1: Vector Chunking (always runs)
+                        prep_future = executor.submit(prepare_chunks, content, 512)
+
+                        # Phase 2 & 3: PageIndex + Graph Extraction
+                        extraction_future = executor.submit(
+                            self._extract_structure_and_graph, source, sample
+                        )
+
+                        prepared = prep_future.result()
+                        extraction_future.result()
+
+                # Skip chunks already seen in this ingest (duplicate files, boilerplate)
+                chunks = []
+                for chunk, digest in prepared:
+                    if digest not in seen_digests:
+                        seen_digests.add(digest)
+                        chunks.append(chunk)
+
+                chunk_batch.extend(chunks)
+                docs_batch.extend(chunks)
+                # One shared metadata dict per source rather than one per chunk
+                src_meta = src_meta_cache.setdefault(source, {"source": source})
+                meta_batch.extend([src_meta] * len(chunks))
+
+                if len(chunk_batch) >= batch_size:
+                    self._embed_and_store(chunk_batch, docs_batch, meta_batch, write_queue)
+                    total_chunks += len(chunk_batch)
+                    chunk_batch, docs_batch, meta_batch = [], [], []
+
+            if chunk_batch:
+                self._embed_and_store(chunk_batch, docs_batch, meta_batch, write_queue)
                 total_chunks += len(chunk_batch)
-                chunk_batch, docs_batch, meta_batch = [], [], []
+        finally:
+            write_queue.put(None)
+            writer.join()
+            self._flush_vector_store()
 
-        if chunk_batch:
-            self._embed_and_store(chunk_batch, docs_batch, meta_batch)
-            total_chunks += len(chunk_batch)
+        if not total_docs:
+            self.logger.warning("No documents found to ingest.")
+            return 0
 
         self.logger.info(
             f"Omni-Ingestion complete! Embedded {total_chunks} chunks. "
@@ -360,17 +499,48 @@ class VDBpipe:
 
         return total_chunks
 
-    def _embed_and_store(self, chunks, docs, metadata):
-        """Embed a batch of text chunks and store in the vector store."""
+    def _embed_and_store(self, chunks, docs, metadata, write_queue: Optional[queue.Queue] = None):
+        """
+        Embed a batch of text chunks and store in the vector store.
+        If `write_queue` is given, the store write is handed to _store_worker
+        instead of being performed inline.
+        """
         if self.embedder is None or self.vector_store is None:
             self.logger.warning("Embedder or vector store not initialized — skipping vector storage.")
             return
         try:
-            embeddings = self.embedder.embed_batch(chunks)
-            self.vector_store.add(embeddings=embeddings, documents=docs, metadata=metadata)
+            import numpy as np
+            # One contiguous float32 matrix per batch so stores can hand it to
+            # their C layer without re-converting a list of Python floats.
+            embeddings = np.ascontiguousarray(self.embedder.embed_batch(chunks), dtype=np.float32)
+            if write_queue is not None:
+                write_queue.put((embeddings, docs, metadata))
+            else:
+                self.vector_store.add(embeddings=embeddings, documents=docs, metadata=metadata)
         except Exception as e:
             self.logger.warning(f"embed_and_store failed: {e}")
 
+    def _store_worker(self, write_queue: queue.Queue):
+        """Writer thread: drain embedded batches into the vector store until a None sentinel."""
+        while True:
+            item = write_queue.get()
+            if item is None:
+                return
+            embeddings, docs, metadata = item
+            try:
+                self.vector_store.add(embeddings=embeddings, documents=docs, metadata=metadata)
+            except Exception as e:
+                self.logger.warning(f"embed_and_store failed: {e}")
+
+    def _flush_vector_store(self):
+        """Persist any writes the vector store has buffered during ingest."""
+        if self.vector_store is None:
+            return
+        try:
+            self.vector_store.flush()
+        except Exception as e:
+            self.logger.warning(f"Vector store flush failed: {e}")
+
     def _extract_structure_and_graph(self, source: str, content_sample: str):
         """
         Phase 2: Builds the PageIndex (always, no LLM needed).
@@ -378,15 +548,7 @@ class VDBpipe:
         """
         try:
             # ── Phase 2: Structural PageIndex ──────────────────────────────
-            lines = [l.strip() for l in content_sample.split("\n") if l.strip()]
-            headings = [l for l in lines if l.startswith("#") or l.isupper()]
-            summary = content_sample[:300].replace("\n", " ")
-            self.page_index[source] = {
-                "chapters": headings[:5] if headings else lines[:3],
-                "summary": summary,
-                "total_chars": len(content_sample),
-                "raw_lines": lines[:15],
-            }
+            self._fast_pageindex(source, content_sample)
 
             # ── Phase 3: Graph Extraction ──────────────────────────────────
             llm = self.llm
@@ -418,10 +580,46 @@ class VDBpipe:
                 self._regex_graph_extract(source, content_sample)
         except Exception as e:
             self.logger.warning(f"Extraction failed for {source}: {e}")
+        finally:
+            self._ingest_version += 1  # invalidate cached graph/page_index dumps
+
+    def _fast_pageindex(self, source: str, content_sample: str):
+        """Phase 2: Builds the PageIndex entry for `source` from heading heuristics."""
+        lines = [l for l in (raw.strip() for raw in content_sample.splitlines()) if l]
+        headings = [m.group(1).strip() for m in islice(_HEADING_RE.finditer(content_sample), 5)]
+        self.page_index[source] = {
+            "chapters": headings if headings else lines[:3],
+            "summary": content_sample[:300].replace("\n", " "),
+            "total_chars": len(content_sample),
+            "raw_lines": lines[:15],
+        }
+
+    def _page_index_dump(self) -> str:
+        """JSON dump of page_index, rebuilt only after new ingestion."""
+        if self._pi_dump_version != self._ingest_version:
+            self._pi_dump_cache = json.dumps(self.page_index, indent=2)
+            self._pi_dump_version = self._ingest_version
+        return self._pi_dump_cache
+
+    def _graph_edge_dump(self) -> List[tuple]:
+        """
+        Snapshot of graph edges as (searchable_text, formatted_line) pairs,
+        rebuilt only after new ingestion.
+        """
+        if self._graph_dump_version != self._ingest_version:
+            dump = []
+            for u, v, d in self.graph.edges(data=True):
+                relation = d.get("relation", "related_to")
+                dump.append((
+                    f"{u} {d.get('relation', '')} {v}".lower(),
+                    f"{u}  --[{relation}]-->  {v}",
+                ))
+            self._graph_dump_cache = dump
+            self._graph_dump_version = self._ingest_version
+        return self._graph_dump_cache
 
     def _regex_graph_extract(self, source: str, content_sample: str):
         """Fallback graph extraction using regex when LLM is absent."""
-        import re
         relation_patterns = [
             (r"([A-Z][a-zA-Z ]{2,25}) is ([A-Z][a-zA-Z ]{2,25})", "is"),
             (r"([A-Z][a-zA-Z ]{2,25}) has ([A-Z][a-zA-Z ]{2,25})", "has"),
@@ -474,7 +672,7 @@ class VDBpipe:
         """Holistic reading via PageIndex — bypasses vector search entirely."""
         if not self.page_index:
             return "PageIndex is empty. Please run ingest() first."
-        index_dump = json.dumps(self.page_index, indent=2)
+        index_dump = self._page_index_dump()
         if not self.llm:
             lines = []
             for src, data in self.page_index.items():
@@ -505,8 +703,7 @@ class VDBpipe:
         Multi-hop reasoning over the NetworkX Knowledge Graph.
         Filters edges by query relevance; falls back to Engine 1 if graph is empty.
         """
-        import re as _re
-        edges = list(self.graph.edges(data=True))
+        edges = self._graph_edge_dump()
         if not edges:
             self.logger.info("Graph empty — falling back to Engine 1 (Vector RAG)")
             return (
@@ -521,27 +718,19 @@ class VDBpipe:
         }
         keywords = [
             w.lower()
-            for w in _re.findall(r"\b\w{3,}\b", query)
+            for w in re.findall(r"\b\w{3,}\b", query)
             if w.lower() not in stop_words
         ]
 
-        def edge_is_relevant(u, v, d):
-            text = f"{u} {d.get('relation', '')} {v}".lower()
-            return any(kw in text for kw in keywords)
-
-        relevant_edges = [(u, v, d) for u, v, d in edges if edge_is_relevant(u, v, d)]
+        relevant_lines = [
+            line for text, line in edges if any(kw in text for kw in keywords)
+        ]
 
-        if relevant_edges:
-            graph_lines = [
-                f"{u}  --[{d.get('relation', 'related_to')}]-->  {v}"
-                for u, v, d in relevant_edges[:20]
-            ]
-            context_note = f"Found {len(relevant_edges)} relevant connections for query: '{query}'"
+        if relevant_lines:
+            graph_lines = relevant_lines[:20]
+            context_note = f"Found {len(relevant_lines)} relevant connections for query: '{query}'"
         else:
-            graph_lines = [
-                f"{u}  --[{d.get('relation', 'related_to')}]-->  {v}"
-                for u, v, d in edges[:20]
-            ]
+            graph_lines = [line for _, line in edges[:20]]
             context_note = (
                 f"No direct graph matches for '{query}'. Showing full graph "
                 f"({len(edges)} total edges) and supplementing with vector search."
@@ -600,7 +789,6 @@ class VDBpipe:
                 user_query=query,
                 retrieved_context="",
             )
-            import re
             match = re.search(r"\{.*\}", response, re.DOTALL)
             if match:
                 return json.loads(match.group(0))
@@ -616,10 +804,14 @@ class VDBpipe:
         """
         Semantic similarity search against the vector store.
         Returns list of {document, score, metadata} dicts.
+        With `query_batching.enabled` in config, concurrent calls are grouped
+        into one embedding + one vector-store call by a QueryBatcher.
         """
         if self.embedder is None or self.vector_store is None:
             return []
         try:
+            if self._query_batcher is not None:
+                return self._query_batcher.submit(query, top_k).result()
             query_embedding = self.embedder.embed_text(query)
             return self.vector_store.search(query_embedding, top_k=top_k)
         except Exception as e:
@@ -0,0 +1,284 @@
+import faiss
+import numpy as np
+import pytest
+from vectorDBpipe.vectordb.faiss_client import FaissDatabase
+
+
+def _random_vectors(n, dim=8, seed=0):
+    return np.random.default_rng(seed).random((n, dim), dtype=np.float32)
+
+
+def test_hnsw_index_search(tmp_path):
+    db = FaissDatabase("hnsw_test", save_dir=str(tmp_path), dimension=8, index_type="hnsw")
+    vectors = _random_vectors(50)
+    db.add(vectors, [f"doc{i}" for i in range(50)], [{} for _ in range(50)])
+
+    results = db.search(vectors[7], top_k=1)
+    assert results[0]["document"] == "doc7"
+    assert db.index.hnsw.efConstruction == 200 and db.index.hnsw.efSearch == 64
+    assert db.search(vectors[7], top_k=1, ef_search=128)[0]["document"] == "doc7"
+    assert db.index.hnsw.efSearch == 64
+
+
+def test_ivfflat_rebuilds_after_train_size(tmp_path):
+    db = FaissDatabase("ivf_test", save_dir=str(tmp_path), dimension=8, index_type="ivfflat", ivf_train_size=64, nprobe=64)
+    vectors = _random_vectors(100)
+    db.add(vectors[:32], [f"doc{i}" for i in range(32)], [{} for _ in range(32)])
+    assert db.index.ntotal == 32 and not isinstance(db.index, faiss.IndexIVF)
+
+    db.add(vectors[32:], [f"doc{i}" for i in range(32, 100)], [{} for _ in range(68)])
+    assert db.index.ntotal == 100 and isinstance(db.index, faiss.IndexIVF)
+    assert db.search(vectors[80], top_k=1)[0]["document"] == "doc80"
+
+
+def test_unknown_index_type_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        FaissDatabase("bad", save_dir=str(tmp_path), index_type="lsh")
+
+
+def test_search_batch_matches_single_search(tmp_path):
+    db = FaissDatabase("batch_test", save_dir=str(tmp_path), dimension=8)
+    vectors = _random_vectors(20)
+    db.add(vectors, [f"doc{i}" for i in range(20)], [{} for _ in range(20)])
+
+    batched = db.search_batch(vectors[:3], top_k=2)
+    assert batched == [db.search(v, top_k=2) for v in vectors[:3]]
+
+
+def test_scores_are_cosine_similarity(tmp_path):
+    db = FaissDatabase("cosine_test", save_dir=str(tmp_path), dimension=2)
+    vectors = np.array([[3.0, 0.0], [0.0, 5.0]], dtype=np.float32)
+    db.add(vectors, ["x", "y"], [{}, {}])
+
+    # Inputs are normalized on a copy, never in place
+    assert vectors[0, 0] == 3.0
+    results = db.search([10.0, 10.0], top_k=2)
+    assert [r["score"] for r in results] == pytest.approx([np.sqrt(0.5)] * 2)
+    assert db.search([2.0, 0.0], top_k=1)[0] == {"id": None, "document": "x", "metadata": {}, "score": pytest.approx(1.0)}
+
+
+def test_add_defers_index_write_until_flush(tmp_path):
+    db = FaissDatabase("flush_test", save_dir=str(tmp_path), dimension=8)
+    vectors = _random_vectors(10)
+    db.add(vectors, [f"doc{i}" for i in range(10)], [{"i": i} for i in range(10)])
+    assert not (tmp_path / "flush_test.index").exists()
+
+    db.flush()
+    reopened = FaissDatabase("flush_test", save_dir=str(tmp_path), dimension=8)
+    assert reopened.index.ntotal == 10
+    assert reopened.metadata_store[3] == {"document": "doc3", "metadata": {"i": 3}, "id": None}
+
+
+def test_flush_every_and_unflushed_rows_dropped_on_reload(tmp_path):
+    db = FaissDatabase("auto_flush", save_dir=str(tmp_path), dimension=8, flush_every=10)
+    vectors = _random_vectors(15)
+    db.add(vectors[:10], [f"doc{i}" for i in range(10)], [{} for _ in range(10)])
+    db.add(vectors[10:], [f"doc{i}" for i in range(10, 15)], [{} for _ in range(5)])
+
+    # Only the first batch reached the index file; its metadata must line up
+    reopened = FaissDatabase("auto_flush", save_dir=str(tmp_path), dimension=8)
+    assert reopened.index.ntotal == 10
+    assert len(reopened.metadata_store) == 10
+
+
+def test_context_manager_flushes_on_exit(tmp_path):
+    vectors = _random_vectors(5)
+    with FaissDatabase("ctx_test", save_dir=str(tmp_path), dimension=8) as db:
+        db.add(vectors, [f"doc{i}" for i in range(5)], [{} for _ in range(5)])
+    assert db._dirty_since_flush == 0
+    db.close()
+
+    reopened = FaissDatabase("ctx_test", save_dir=str(tmp_path), dimension=8)
+    assert reopened.index.ntotal == 5 and len(reopened.metadata_store) == 5
+
+
+def test_unflushed_instance_warns_when_discarded(tmp_path):
+    db = FaissDatabase("discard_test", save_dir=str(tmp_path), dimension=8)
+    db.add(_random_vectors(3), ["a", "b", "c"], [{}, {}, {}])
+    with pytest.warns(ResourceWarning, match="unflushed"):
+        db.__del__()
+    db.close()
+
+
+def test_legacy_pickle_metadata_is_migrated(tmp_path):
+    import pickle
+    index = faiss.IndexFlatIP(8)
+    index.add(_random_vectors(2))
+    faiss.write_index(index, str(tmp_path / "legacy.index"))
+    entries = [{"document": "a", "metadata": {}, "id": "1"}, {"document": "b", "metadata": {}, "id": "2"}]
+    with open(tmp_path / "legacy_meta.pkl", "wb") as f:
+        pickle.dump(entries, f)
+
+    db = FaissDatabase("legacy", save_dir=str(tmp_path), dimension=8)
+    assert db.metadata_store == entries
+    assert (tmp_path / "legacy_meta.jsonl").exists()
+
+
+def test_legacy_l2_index_is_migrated_to_cosine(tmp_path):
+    import pickle
+    vectors = np.array([[3.0, 4.0], [-4.0, 3.0], [6.0, 8.0]], dtype=np.float32)
+    index = faiss.IndexFlatL2(2)
+    index.add(vectors)
+    faiss.write_index(index, str(tmp_path / "l2.index"))
+    with open(tmp_path / "l2_meta.pkl", "wb") as f:
+        pickle.dump([{"document": d, "metadata": {}, "id": d} for d in "abc"], f)
+
+    db = FaissDatabase("l2", save_dir=str(tmp_path), dimension=2)
+    assert db.index.metric_type == faiss.METRIC_INNER_PRODUCT
+    results = db.search([3.0, 4.0], top_k=3)
+    assert [r["score"] for r in results] == pytest.approx([1.0, 1.0, 0.0], abs=1e-5)
+    assert results[-1]["id"] == "b"
+    # The migrated index was written back, so reopening does not migrate again
+    assert faiss.read_index(str(tmp_path / "l2.index")).metric_type == faiss.METRIC_INNER_PRODUCT
+
+
+def test_add_pads_missing_metadata_and_ids(tmp_path):
+    db = FaissDatabase("pad_test", save_dir=str(tmp_path), dimension=8)
+    db.add(_random_vectors(3), ["a", "b", "c"], [{"k": 1}], ids=["id-a", "id-b"])
+    assert db.metadata_store == [
+        {"document": "a", "metadata": {"k": 1}, "id": "id-a"},
+        {"document": "b", "metadata": {}, "id": "id-b"},
+        {"document": "c", "metadata": {}, "id": None},
+    ]
+
+
+def test_numpy_metadata_round_trips(tmp_path):
+    db = FaissDatabase("np_meta", save_dir=str(tmp_path), dimension=8)
+    db.add(_random_vectors(1), ["a"], [{"page": np.int64(4), "bbox": np.array([1.0, 2.0])}])
+    db.flush()
+
+    reopened = FaissDatabase("np_meta", save_dir=str(tmp_path), dimension=8)
+    assert reopened.metadata_store[0]["metadata"] == {"page": 4, "bbox": [1.0, 2.0]}
+
+
+def test_int_metadata_keys_round_trip(tmp_path):
+    db = FaissDatabase("int_keys", save_dir=str(tmp_path), dimension=8)
+    db.add(_random_vectors(1), ["a"], [{1: "page one"}])
+    db.flush()
+
+    reopened = FaissDatabase("int_keys", save_dir=str(tmp_path), dimension=8)
+    assert reopened.index.ntotal == 1
+    assert reopened.metadata_store[0]["metadata"] == {"1": "page one"}
+
+
+def test_unserializable_metadata_leaves_index_untouched(tmp_path):
+    db = FaissDatabase("bad_meta", save_dir=str(tmp_path), dimension=8)
+    with pytest.raises(TypeError):
+        db.add(_random_vectors(1), ["a"], [{"obj": object()}])
+    assert db.index.ntotal == 0 and db.metadata_store == []
+
+
+def test_binary_quantization_round_trip(tmp_path):
+    db = FaissDatabase("bin_test", save_dir=str(tmp_path), dimension=16, quantization="binary")
+    vectors = np.random.default_rng(1).standard_normal((30, 16)).astype(np.float32)
+    db.add(vectors, [f"doc{i}" for i in range(30)], [{} for _ in range(30)])
+    assert isinstance(db.index, faiss.IndexBinaryFlat)
+
+    top = db.search(vectors[5], top_k=1)[0]
+    assert top["document"] == "doc5" and top["score"] == 1.0
+
+    db.flush()
+    reopened = FaissDatabase("bin_test", save_dir=str(tmp_path), dimension=16, quantization="binary")
+    assert reopened.index.ntotal == 30
+
+
+def test_binary_quantization_requires_byte_aligned_flat(tmp_path):
+    with pytest.raises(ValueError):
+        FaissDatabase("bin_bad", save_dir=str(tmp_path), dimension=12, quantization="binary")
+    with pytest.raises(ValueError):
+        FaissDatabase("bin_bad", save_dir=str(tmp_path), dimension=16, index_type="hnsw", quantization="binary")
+
+
+def test_query_cache_is_invalidated_by_add(tmp_path):
+    db = FaissDatabase("cache_test", save_dir=str(tmp_path), dimension=8, query_cache_size=8)
+    vectors = _random_vectors(3)
+    db.add(vectors[:1], ["a"], [{}])
+    assert db.search(vectors[2], top_k=5) == db.search(vectors[2], top_k=5)
+    assert len(db._query_cache) == 1
+
+    db.add(vectors[1:2], ["b"], [{}])
+    assert len(db._query_cache) == 0
+    assert len(db.search(vectors[2], top_k=5)) == 2
+
+
+@pytest.mark.skipif(hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0, reason="GPU present")
+def test_gpu_device_falls_back_to_cpu(tmp_path):
+    db = FaissDatabase("gpu_test", save_dir=str(tmp_path), dimension=8, device="gpu")
+    assert db.device == "cpu" and db.get_collection_info()["device"] == "cpu"
+    db.add(_random_vectors(2), ["a", "b"], [{}, {}])
+    assert len(db.search(_random_vectors(1)[0], top_k=2)) == 2
+
+
+def test_prepare_vectors_reuses_unit_float32_input(tmp_path):
+    db = FaissDatabase("prep_test", save_dir=str(tmp_path), dimension=2)
+    unit = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+    assert np.shares_memory(db._prepare_vectors(unit), unit)
+
+    raw = np.array([[3.0, 4.0]], dtype=np.float32)
+    prepared = db._prepare_vectors(raw)
+    assert not np.shares_memory(prepared, raw) and raw[0, 0] == 3.0
+    assert prepared[0] == pytest.approx([0.6, 0.8])
+
+
+def test_add_rejects_wrong_dimension(tmp_path):
+    db = FaissDatabase("dim_test", save_dir=str(tmp_path), dimension=8)
+    with pytest.raises(ValueError):
+        db.add(_random_vectors(3, dim=16), ["a", "b", "c"], [{}, {}, {}])
+    assert db.index.ntotal == 0 and db.metadata_store == []
+
+    db.add(_random_vectors(1), ["a"], [{}])
+    with pytest.raises(ValueError):
+        db.search(np.ones(4, dtype=np.float32))
+
+
+def test_numpy_fallback_without_faiss(tmp_path, monkeypatch):
+    from vectorDBpipe.vectordb import faiss_client
+    monkeypatch.setattr(faiss_client, "faiss", None)
+
+    db = FaissDatabase("nofaiss", save_dir=str(tmp_path), dimension=8, index_type="hnsw")
+    assert isinstance(db.index, faiss_client._NumpyFlatIndex) and db.index_type == "flat"
+    vectors = _random_vectors(40)
+    db.add(vectors[:25], [f"doc{i}" for i in range(25)], [{} for _ in range(25)])
+    db.add(vectors[25:], [f"doc{i}" for i in range(25, 40)], [{} for _ in range(15)])
+
+    top = db.search(vectors[31], top_k=3)
+    assert top[0]["document"] == "doc31" and top[0]["score"] == pytest.approx(1.0, abs=1e-5)
+    assert [r["score"] for r in top] == sorted((r["score"] for r in top), reverse=True)
+
+    db.flush()
+    reopened = FaissDatabase("nofaiss", save_dir=str(tmp_path), dimension=8)
+    assert reopened.index.ntotal == 40
+    assert reopened.search(vectors[3], top_k=1)[0]["document"] == "doc3"
+
+
+def test_numpy_flat_index_pads_short_results():
+    from vectorDBpipe.vectordb.faiss_client import _NumpyFlatIndex
+    index = _NumpyFlatIndex(8)
+    index.add(_random_vectors(2))
+    distances, labels = index.search(_random_vectors(1, seed=3), 4)
+    assert labels[0, 2:].tolist() == [-1, -1] and sorted(labels[0, :2].tolist()) == [0, 1]
+
+
+def test_read_only_maps_saved_index_and_rejects_writes(tmp_path):
+    db = FaissDatabase("ro_test", save_dir=str(tmp_path), dimension=8)
+    vectors = _random_vectors(10)
+    db.add(vectors, [f"doc{i}" for i in range(10)], [{} for _ in range(10)])
+    db.flush()
+
+    ro = FaissDatabase("ro_test", save_dir=str(tmp_path), dimension=8, read_only=True)
+    assert ro.search(vectors[4], top_k=1)[0]["document"] == "doc4"
+    with pytest.raises(RuntimeError):
+        ro.add(vectors[:1], ["x"], [{}])
+    with pytest.raises(FileNotFoundError):
+        FaissDatabase("missing", save_dir=str(tmp_path), dimension=8, read_only=True)
+
+
+@pytest.mark.skipif(not hasattr(faiss.IndexFlatIP(8).codes, "owned_data"), reason="faiss < 1.10 code buffer layout")
+def test_reserve_presizes_flat_storage(tmp_path):
+    db = FaissDatabase("reserve_test", save_dir=str(tmp_path), dimension=8, reserve=1000)
+    buffer_ptr = int(db.index.codes.owned_data.data())
+    vectors = _random_vectors(500)
+    for start in range(0, 500, 50):
+        db.add(vectors[start:start + 50], ["d"] * 50, [{}] * 50)
+    assert int(db.index.codes.owned_data.data()) == buffer_ptr
+    assert db.index.ntotal == 500 and db.search(vectors[321], top_k=1)[0]["score"] == pytest.approx(1.0)
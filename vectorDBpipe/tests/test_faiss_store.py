@@ -44,3 +44,269 @@ def test_faiss_search_without_persist(tmp_path):
 
     # Still not on disk
     assert not os.path.exists(index_path)
+
+def test_faiss_batch_durability_flushes_at_threshold(tmp_path):
+    index_path = str(tmp_path / "faiss_batch.index")
+    store = FaissVectorStore(index_path=index_path, dirty_threshold=3)
+
+    store.insert_vectors([[0.1, 0.2], [0.3, 0.4]], [{}, {}])
+    assert not os.path.exists(index_path)
+    store.insert_vectors([[0.5, 0.6]], [{}])
+    assert os.path.exists(index_path)
+
+    reloaded = FaissVectorStore(index_path=index_path)
+    assert reloaded.index.ntotal == 3
+
+def test_faiss_always_and_manual_durability(tmp_path):
+    always = FaissVectorStore(index_path=str(tmp_path / "always.index"), durability="always")
+    always.insert_vectors([[0.1, 0.2]], [{}])
+    assert os.path.exists(str(tmp_path / "always.index"))
+
+    manual_path = str(tmp_path / "manual.index")
+    manual = FaissVectorStore(index_path=manual_path, durability="manual", dirty_threshold=1)
+    manual.insert_vectors([[0.1, 0.2]], [{}])
+    assert not os.path.exists(manual_path)
+    manual.close()
+    assert os.path.exists(manual_path)
+
+    with pytest.raises(ValueError):
+        FaissVectorStore(index_path=str(tmp_path / "bad.index"), durability="sometimes")
+
+def test_faiss_add_numpy_bulk(tmp_path):
+    import numpy as np
+    store = FaissVectorStore(index_path=str(tmp_path / "bulk.index"))
+    matrix = np.random.default_rng(0).random((20, 4), dtype=np.float32)
+    store.add_numpy_bulk(matrix, [{"id": f"v{i}"} for i in range(20)])
+
+    assert store.index.ntotal == 20
+    assert store.search_vectors(matrix[7], top_k=1)[0]["id"] == "v7"
+    with pytest.raises(ValueError):
+        store.add_numpy_bulk(matrix[0])
+
+@pytest.mark.parametrize("index_type", ["ivf_flat", "ivf_sq8", "ivf_pq"])
+def test_faiss_ivf_trains_after_train_size(tmp_path, index_type):
+    import numpy as np
+    store = FaissVectorStore(index_path=str(tmp_path / "ivf.index"), index_type=index_type,
+                             nlist=4, nprobe=4, m=4, nbits=4, train_size=200)
+    vectors = np.random.default_rng(0).random((300, 8), dtype=np.float32)
+    store.insert_vectors(vectors[:100], [{"id": f"v{i}"} for i in range(100)])
+    assert store.faiss.try_extract_index_ivf(store.index) is None
+
+    store.insert_vectors(vectors[100:], [{"id": f"v{i}"} for i in range(100, 300)])
+    assert store.faiss.try_extract_index_ivf(store.index) is not None and store.index.ntotal == 300
+    assert store.search_vectors(vectors[250], top_k=5)[0]["id"].startswith("v")
+
+def test_faiss_hnsw_index_type(tmp_path):
+    import numpy as np
+    store = FaissVectorStore(index_path=str(tmp_path / "hnsw.index"), index_type="hnsw")
+    vectors = np.random.default_rng(1).random((50, 8), dtype=np.float32)
+    store.insert_vectors(vectors, [{"id": f"v{i}"} for i in range(50)])
+    assert store.search_vectors(vectors[9], top_k=1)[0]["id"] == "v9"
+
+def test_faiss_cosine_metric_scores(tmp_path):
+    import numpy as np
+    store = FaissVectorStore(index_path=str(tmp_path / "cos.index"), metric="cosine")
+    vectors = np.array([[3.0, 0.0], [0.0, 2.0]], dtype=np.float32)
+    store.insert_vectors(vectors, [{"id": "x"}, {"id": "y"}])
+
+    assert vectors[0, 0] == 3.0  # caller's array is not normalized in place
+    results = store.search_vectors([5.0, 0.0], top_k=2)
+    assert [r["id"] for r in results] == ["x", "y"]
+    assert [r["score"] for r in results] == pytest.approx([1.0, 0.5])
+
+def test_faiss_ip_metric_returns_raw_inner_product(tmp_path):
+    store = FaissVectorStore(index_path=str(tmp_path / "ip.index"), metric="ip")
+    store.insert_vectors([[1.0, 2.0]], [{"id": "a"}])
+    assert store.search_vectors([3.0, 1.0], top_k=1)[0]["score"] == pytest.approx(5.0)
+
+def test_faiss_search_vectors_batch_matches_single(tmp_path):
+    import numpy as np
+    store = FaissVectorStore(index_path=str(tmp_path / "batch.index"))
+    rng = np.random.default_rng(0)
+    store.insert_vectors(rng.standard_normal((20, 8)).astype("float32"), [{"id": f"v{i}"} for i in range(20)])
+
+    queries = rng.standard_normal((3, 8)).astype("float32")
+    batch = store.search_vectors_batch(queries, top_k=4)
+    assert len(batch) == 3
+    for query, hits in zip(queries, batch):
+        assert hits == store.search_vectors(query, top_k=4)
+
+def test_faiss_metadata_roundtrip_and_legacy_dict(tmp_path):
+    import pickle
+    index_path = str(tmp_path / "soa.index")
+    store = FaissVectorStore(index_path=index_path)
+    store.insert_vectors([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]], [{"id": "a"}, {"text": "b"}])
+    store.persist()
+
+    reloaded = FaissVectorStore(index_path=index_path)
+    assert list(reloaded._ids) == ["a", "id_1", "2"]
+    assert reloaded.search_vectors([0.0, 1.0], top_k=1)[0]["metadata"] == {"text": "b", "id": "id_1"}
+
+    # Stores written before the list layout pickled {internal_id: metadata}
+    os.remove(index_path + "_ids.npy")
+    with open(index_path + "_metadata.pkl", "wb") as f:
+        pickle.dump({0: {"id": "a"}, 1: {"id": "legacy"}}, f)
+    legacy = FaissVectorStore(index_path=index_path)
+    assert list(legacy._ids) == ["a", "legacy", "2"]
+    assert legacy.metadata_store[2] == {}
+
+def test_faiss_num_threads_is_applied_once(tmp_path):
+    import faiss
+    before = faiss.omp_get_max_threads()
+    try:
+        store = FaissVectorStore(index_path=str(tmp_path / "threads.index"), num_threads=1)
+        store.insert_vectors([[1.0, 0.0], [0.0, 1.0]], [{"id": "a"}, {"id": "b"}])
+        assert store.search_vectors([1.0, 0.0], top_k=1)[0]["id"] == "a"
+        # Searching leaves the process-wide setting alone
+        assert faiss.omp_get_max_threads() == 1
+    finally:
+        faiss.omp_set_num_threads(before)
+
+
+@pytest.mark.parametrize("quantize", ["int8", "fp16"])
+def test_faiss_scalar_quantized_flat(tmp_path, quantize):
+    import numpy as np
+    store = FaissVectorStore(index_path=str(tmp_path / "sq.index"), quantize=quantize, train_size=100)
+    vectors = np.random.default_rng(2).random((150, 8), dtype=np.float32)
+    store.insert_vectors(vectors, [{"id": f"v{i}"} for i in range(150)])
+    inner = store.faiss.downcast_index(store.index.index)
+    assert isinstance(inner, store.faiss.IndexScalarQuantizer) and store.index.ntotal == 150
+    assert store.search_vectors(vectors[42], top_k=1)[0]["id"] == "v42"
+
+def test_faiss_quantize_rejects_unsupported_index_type(tmp_path):
+    with pytest.raises(ValueError):
+        FaissVectorStore(index_path=str(tmp_path / "bad.index"), index_type="hnsw", quantize="int8")
+
+def test_faiss_mmap_load_then_insert(tmp_path):
+    index_path = str(tmp_path / "mmap.index")
+    store = FaissVectorStore(index_path=index_path)
+    store.insert_vectors([[1.0, 0.0], [0.0, 1.0]], [{"id": "a"}, {"id": "b"}])
+    store.persist()
+
+    mapped = FaissVectorStore(index_path=index_path, mmap=True)
+    assert mapped.search_vectors([0.0, 1.0], top_k=1)[0]["id"] == "b"
+    mapped.insert_vectors([[1.0, 1.0]], [{"id": "c"}])
+    mapped.persist()
+    assert FaissVectorStore(index_path=index_path).index.ntotal == 3
+
+def test_faiss_io_read_index_mapped_flag(tmp_path):
+    import faiss
+    import numpy as np
+    from vectorDBpipe.vectordb import faiss_io
+    index_path = str(tmp_path / "io.index")
+    index = faiss.IndexFlatIP(2)
+    index.add(np.eye(2, dtype="float32"))
+    faiss.write_index(index, index_path)
+
+    mapped, is_mapped = faiss_io.read_index(index_path, mmap=True)
+    loaded, not_mapped = faiss_io.read_index(index_path)
+    assert is_mapped and not not_mapped
+    assert mapped.ntotal == loaded.ntotal == 2
+    assert faiss_io.gpu_resources("cpu") is None
+
+def test_faiss_cuda_device_falls_back_to_cpu(tmp_path):
+    import faiss
+    if hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0:
+        pytest.skip("GPU present")
+    store = FaissVectorStore(index_path=str(tmp_path / "gpu.index"), device="cuda")
+    assert store.device == "cpu"
+    store.insert_vectors([[1.0, 0.0]], [{"id": "a"}])
+    assert store.search_vectors([1.0, 0.0], top_k=1)[0]["id"] == "a"
+
+def test_faiss_insert_is_tiled(tmp_path):
+    import numpy as np
+    # 4 dims * 4 bytes * 3 rows per tile -> 10 vectors take 4 adds
+    store = FaissVectorStore(index_path=str(tmp_path / "tiles.index"), tile_bytes=48)
+    vectors = np.random.default_rng(3).random((10, 4)).tolist()
+    store.insert_vectors(vectors, [{"id": f"v{i}"} for i in range(10)])
+    assert store.index.ntotal == 10
+    assert store.search_vectors(vectors[7], top_k=1)[0]["id"] == "v7"
+
+def test_faiss_ragged_batch_leaves_index_untouched(tmp_path):
+    store = FaissVectorStore(index_path=str(tmp_path / "ragged.index"), tile_bytes=8)
+    store.insert_vectors([[1.0, 0.0]], [{"id": "a"}])
+    with pytest.raises(ValueError):
+        store.insert_vectors([[1.0, 0.0], [0.0, 1.0], [1.0]], [{"id": "b"}, {"id": "c"}, {"id": "d"}])
+    assert store.index.ntotal == len(store._meta) == 1
+
+    store.insert_vectors([[0.0, 1.0]], [{"id": "b"}])
+    assert store.search_vectors([0.0, 1.0], top_k=1)[0]["id"] == "b"
+
+def test_faiss_int_ids_survive_reload(tmp_path):
+    index_path = str(tmp_path / "int_ids.index")
+    store = FaissVectorStore(index_path=index_path)
+    store.insert_vectors([[1.0, 0.0], [0.0, 1.0]], [{"id": 7}, {"id": "b"}])
+    store.persist()
+
+    reopened = FaissVectorStore(index_path=index_path)
+    assert reopened.search_vectors([1.0, 0.0], top_k=1)[0]["id"] == 7
+    reopened.delete_vector(7)
+    assert reopened.index.ntotal == 1
+    assert [r["id"] for r in reopened.search_vectors([1.0, 0.0], top_k=5)] == ["b"]
+
+def test_faiss_search_pads_short_results(tmp_path):
+    store = FaissVectorStore(index_path=str(tmp_path / "short.index"))
+    store.insert_vectors([[0.0, 0.0], [3.0, 4.0]], [{"id": "o"}, {"id": "p"}])
+    results = store.search_vectors([0.0, 0.0], top_k=5)
+    assert [r["id"] for r in results] == ["o", "p"]
+    assert [r["score"] for r in results] == pytest.approx([1.0, 1 / 26])
+
+def test_faiss_update_and_delete_vector(tmp_path):
+    index_path = str(tmp_path / "mutable.index")
+    store = FaissVectorStore(index_path=index_path)
+    store.insert_vectors([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]], [{"id": "a"}, {"id": "b"}, {"id": "c"}])
+
+    store.delete_vector("a")
+    assert [r["id"] for r in store.search_vectors([1.0, 0.0], top_k=3)] == ["c", "b"]
+
+    store.update_vector("b", [5.0, 5.0], {"text": "moved"})
+    top = store.search_vectors([5.0, 5.0], top_k=1)[0]
+    assert top["id"] == "b" and top["metadata"] == {"text": "moved", "id": "b"}
+
+    # New rows get fresh ids after the tombstone, and the layout survives a reload
+    store.insert_vectors([[-1.0, 0.0]], [{"id": "d"}])
+    store.persist()
+    reloaded = FaissVectorStore(index_path=index_path)
+    assert reloaded.index.ntotal == 3
+    assert reloaded.search_vectors([-1.0, 0.0], top_k=1)[0]["id"] == "d"
+    assert 0 not in reloaded.metadata_store
+
+def test_faiss_id_map_tracks_duplicates_and_reload(tmp_path):
+    index_path = str(tmp_path / "dups.index")
+    store = FaissVectorStore(index_path=index_path)
+    store.insert_vectors([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]], [{"id": "a"}, {"id": "a"}, {"id": "b"}])
+    assert store._find("a").tolist() == [0, 1]
+
+    store.update_vector("a", [0.0, 1.0])
+    assert store._find("a").tolist() == [0] and store.index.ntotal == 2
+    store.persist()
+
+    reloaded = FaissVectorStore(index_path=index_path)
+    assert reloaded._id_rows == {"a": [0], "b": [2]}
+    reloaded.delete_vector("a")
+    assert not len(reloaded._find("a")) and reloaded.index.ntotal == 1
+
+def test_faiss_legacy_unmapped_index_is_rebuilt(tmp_path):
+    import faiss
+    import numpy as np
+    import pickle
+    index_path = str(tmp_path / "legacy.index")
+    legacy = faiss.IndexFlatL2(2)
+    legacy.add(np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32))
+    faiss.write_index(legacy, index_path)
+    with open(index_path + "_metadata.pkl", "wb") as f:
+        pickle.dump({0: {"id": "x"}, 1: {"id": "y"}}, f)
+
+    store = FaissVectorStore(index_path=index_path)
+    assert isinstance(store.index, faiss.IndexIDMap2) and store.index.ntotal == 2
+    store.delete_vector("x")
+    assert [r["id"] for r in store.search_vectors([1.0, 0.0], top_k=2)] == ["y"]
+
+def test_faiss_hnsw_rejects_delete_and_update(tmp_path):
+    store = FaissVectorStore(index_path=str(tmp_path / "hnsw_del.index"), index_type="hnsw")
+    store.insert_vectors([[1.0, 0.0]], [{"id": "a"}])
+    with pytest.raises(ValueError, match="HNSW"):
+        store.delete_vector("a")
+    with pytest.raises(ValueError, match="HNSW"):
+        store.update_vector("a", [0.0, 1.0])
+    assert store.search_vectors([1.0, 0.0], top_k=1)[0]["id"] == "a"
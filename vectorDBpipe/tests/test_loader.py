@@ -9,3 +9,10 @@ def test_load_txt(tmp_path):
     assert isinstance(result, list)
     assert "Hello AI World!" in result[0]["content"]
 
+
+def test_iter_data_streams_directory(tmp_path):
+    (tmp_path / "a.txt").write_text("First file")
+    (tmp_path / "b.txt").write_text("Second file")
+    docs = DataLoader(data_path=str(tmp_path)).iter_data()
+    assert not isinstance(docs, list)
+    assert sorted(d["content"] for d in docs) == ["First file", "Second file"]
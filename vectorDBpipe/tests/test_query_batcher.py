@@ -0,0 +1,32 @@
+import pytest
+from vectorDBpipe.pipeline.query_batcher import QueryBatcher
+
+
+class _Embedder:
+    def embed_batch(self, texts):
+        return [[float(len(t))] for t in texts]
+
+
+class _Store:
+    def __init__(self, drop=0):
+        self.drop = drop
+
+    def search_batch(self, vectors, top_k=5):
+        results = [[{"id": i, "score": 1.0}] * top_k for i in range(len(vectors))]
+        return results[:len(results) - self.drop]
+
+
+def test_results_are_split_per_query():
+    batcher = QueryBatcher(_Embedder(), _Store(), max_batch_size=2, max_wait_ms=50)
+    futures = [batcher.submit("a", top_k=1), batcher.submit("b", top_k=3)]
+    batcher.close()
+    assert [len(f.result(timeout=1)) for f in futures] == [1, 3]
+
+
+def test_short_search_batch_fails_every_future():
+    batcher = QueryBatcher(_Embedder(), _Store(drop=1), max_batch_size=2, max_wait_ms=50)
+    futures = [batcher.submit("a"), batcher.submit("b")]
+    batcher.close()
+    for future in futures:
+        with pytest.raises(RuntimeError, match="result lists"):
+            future.result(timeout=1)
@@ -0,0 +1,60 @@
+import numpy as np
+from vectorDBpipe.vectordb.query_cache import QueryCache, cached_search, clears_query_cache
+
+
+class _Store:
+    def __init__(self, **options):
+        self._query_cache = QueryCache.from_options(options)
+        self.calls = 0
+
+    @cached_search
+    def search(self, query_embedding, top_k=5):
+        self.calls += 1
+        return [{"id": self.calls, "score": 1.0}]
+
+    @clears_query_cache
+    def add(self):
+        pass
+
+
+def test_disabled_by_default():
+    store = _Store()
+    store.search([1.0, 0.0])
+    store.search([1.0, 0.0])
+    assert store._query_cache is None and store.calls == 2
+
+
+def test_exact_hits_keyed_on_vector_and_top_k():
+    store = _Store(query_cache_size=4)
+    first = store.search(np.array([1.0, 0.0]))
+    assert store.search([1.0, 0.0]) == first and store.calls == 1
+    store.search([1.0, 0.0], top_k=3)
+    store.search([0.0, 1.0])
+    assert store.calls == 3
+
+
+def test_lru_eviction_and_invalidation_on_write():
+    store = _Store(query_cache_size=1)
+    store.search([1.0, 0.0])
+    store.search([0.0, 1.0])
+    store.search([1.0, 0.0])
+    assert store.calls == 3
+
+    store.add()
+    store.search([1.0, 0.0])
+    assert store.calls == 4
+
+
+def test_semantic_threshold_reuses_near_duplicate_queries():
+    store = _Store(query_cache_size=4, query_cache_threshold=0.99)
+    store.search([1.0, 0.0])
+    store.search([1.0, 0.01])  # cosine ≈ 0.99995
+    assert store.calls == 1
+    store.search([1.0, 1.0])   # cosine ≈ 0.707
+    assert store.calls == 2
+
+
+def test_hits_return_copies():
+    store = _Store(query_cache_size=2)
+    store.search([1.0])[0]["score"] = 0.0
+    assert store.search([1.0])[0]["score"] == 1.0
@@ -43,3 +43,128 @@ def test_pinecone_init_v3():
         
         store = PineconeVectorStore(api_key="test-key", index_name="new-index")
         mock_client.create_index.assert_called()
+
+def test_get_vector_store_reuses_instances_per_config(tmp_path):
+    config = {"index_path": str(tmp_path / "idx")}
+    store = get_vector_store("faiss", config)
+    assert get_vector_store("FAISS", dict(config)) is store
+    assert get_vector_store("faiss", {"index_path": str(tmp_path / "other")}) is not store
+    assert get_vector_store("faiss", config, shared=False) is not store
+    # Unhashable values are built fresh instead of failing
+    assert get_vector_store("faiss", {**config, "tags": ["x"]}) is not store
+
+
+def _import_with_mocks(module_name, mocked):
+    """Import a backend client module against mocked SDK modules."""
+    import importlib
+    import sys
+    with patch.dict(sys.modules, mocked):
+        sys.modules.pop(module_name, None)
+        return importlib.import_module(module_name)
+
+
+def _weaviate_module():
+    mock_weaviate = MagicMock()
+    return _import_with_mocks("vectorDBpipe.vectordb.weaviate_client", {
+        "weaviate": mock_weaviate,
+        "weaviate.classes": mock_weaviate.classes,
+        "weaviate.classes.init": mock_weaviate.classes.init,
+        "weaviate.classes.config": mock_weaviate.classes.config,
+    }), mock_weaviate
+
+def test_weaviate_client_is_shared_and_closed_by_last_user():
+    module, mock_weaviate = _weaviate_module()
+    client = mock_weaviate.connect_to_local.return_value
+
+    first = module.WeaviateDatabase("docs")
+    second = module.WeaviateDatabase("other")
+    assert mock_weaviate.connect_to_local.call_count == 1
+    assert first.client is second.client is client
+
+    first.close()
+    first.close()  # idempotent: must not release the other instance's share
+    client.close.assert_not_called()
+    with second:
+        pass
+    client.close.assert_called_once()
+    assert module._CLIENT_CACHE == {}
+
+def test_weaviate_unclosed_instance_warns_and_releases():
+    module, mock_weaviate = _weaviate_module()
+    db = module.WeaviateDatabase("docs")
+    with pytest.warns(ResourceWarning):
+        db.__del__()
+    mock_weaviate.connect_to_local.return_value.close.assert_called_once()
+
+def test_weaviate_add_serializes_metadata_once():
+    import json
+    import numpy as np
+    module, _ = _weaviate_module()
+    db = module.WeaviateDatabase("docs")
+    batch = db.collection.batch.dynamic.return_value.__enter__.return_value
+
+    db.add(np.ones((2, 3), dtype=np.float32), ["a", "b"], [{1: "page"}])
+    calls = batch.add_object.call_args_list
+    assert len(calls) == 2
+    assert json.loads(calls[0].kwargs["properties"]["source_meta"]) == {"1": "page"}
+    assert calls[1].kwargs["properties"] == {"text": "b", "source_meta": "{}"}
+    assert calls[0].kwargs["vector"] == [1.0, 1.0, 1.0]
+    assert calls[0].kwargs["uuid"].version == 4
+    db.close()
+
+
+def _pinecone_module():
+    mock_pinecone = MagicMock()
+    return _import_with_mocks("vectorDBpipe.vectordb.pinecone_client", {"pinecone": mock_pinecone}), mock_pinecone
+
+def test_pinecone_index_listing_is_cached_within_ttl(monkeypatch):
+    module, mock_pinecone = _pinecone_module()
+    client = mock_pinecone.Pinecone.return_value
+    client.list_indexes.return_value = [{"name": "docs"}]
+
+    module.PineconeDatabase("docs", api_key="key")
+    module.PineconeDatabase("docs", api_key="key")
+    assert client.list_indexes.call_count == 1
+    client.create_index.assert_not_called()
+
+    monkeypatch.setattr(module, "_INDEX_CACHE_TTL", 0.0)
+    module.PineconeDatabase("docs", api_key="key")
+    assert client.list_indexes.call_count == 2
+
+def test_pinecone_upserts_are_chunked_into_batches_of_100():
+    module, mock_pinecone = _pinecone_module()
+    mock_pinecone.Pinecone.return_value.list_indexes.return_value = [{"name": "docs"}]
+    db = module.PineconeDatabase("docs", api_key="key", upsert_workers=4)
+
+    docs = [f"doc {i}" for i in range(250)]
+    db.add([[0.1, 0.2]] * 250, docs, [])
+    sizes = sorted(len(c.kwargs["vectors"]) for c in db.index.upsert.call_args_list)
+    assert sizes == [50, 100, 100]
+
+
+def _qdrant_module():
+    mock_qdrant = MagicMock()
+    return _import_with_mocks("vectorDBpipe.vectordb.qdrant_client", {
+        "qdrant_client": mock_qdrant,
+        "qdrant_client.http": mock_qdrant.http,
+        "qdrant_client.http.models": mock_qdrant.http.models,
+    }), mock_qdrant
+
+def test_qdrant_add_uses_upload_collection():
+    import numpy as np
+    module, mock_qdrant = _qdrant_module()
+    db = module.QdrantDatabase("docs", mode="cloud", api_key="key", url="https://q.example", dimension=2, upload_batch_size=64)
+    mock_qdrant.QdrantClient.assert_called_with(url="https://q.example", api_key="key", prefer_grpc=True)
+
+    db.add([[1.0, 0.0], [0.0, 1.0]], ["a", "b"], [{"page": 1}], ids=["1", "2"])
+    kwargs = db.client.upload_collection.call_args.kwargs
+    assert kwargs["vectors"].dtype == np.float32 and kwargs["vectors"].shape == (2, 2)
+    assert list(kwargs["payload"]) == [{"page": 1, "text": "a"}, {"text": "b"}]
+    assert kwargs["ids"] == ["1", "2"]
+    assert (kwargs["collection_name"], kwargs["batch_size"], kwargs["parallel"], kwargs["wait"]) == ("docs", 64, 4, True)
+
+def test_qdrant_local_mode_uploads_serially():
+    module, _ = _qdrant_module()
+    db = module.QdrantDatabase("docs", save_dir="unused", dimension=2)
+    db.add([[1.0, 0.0]], ["a"], [])
+    assert db.client.upload_collection.call_args.kwargs["parallel"] == 1
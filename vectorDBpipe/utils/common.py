@@ -1,7 +1,16 @@
 import os
 import re
+import hashlib
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7F]+')
+_SENTENCE_BREAK_RE = re.compile(r'(?<=[.!?])\s+')
+# ASCII code points str.split() treats as whitespace
+_ASCII_WS = np.zeros(256, dtype=bool)
+_ASCII_WS[[9, 10, 11, 12, 13, 28, 29, 30, 31, 32]] = True
 
 
 def ensure_dir(path: str):
@@ -14,9 +23,9 @@ def clean_text(text: str) -> str:
     Basic text cleaning.
     Collapses whitespace and removes non-ASCII characters.
     """
-    text = re.sub(r'\s+', ' ', text)             # Collapse whitespace
-    text = re.sub(r'[^\x00-\x7F]+', ' ', text)  # Remove non-ASCII
-    return text.strip()
+    if not text.isascii():
+        text = _NON_ASCII_RE.sub(' ', text)  # Remove non-ASCII
+    return ' '.join(text.split())            # Collapse whitespace (C-level split, no regex)
 
 
 def chunk_text(text: str, chunk_size: int = 512, overlap: int = 50) -> List[str]:
@@ -30,19 +39,73 @@ def chunk_text(text: str, chunk_size: int = 512, overlap: int = 50) -> List[str]
     :param overlap: Number of words to overlap between consecutive chunks.
     :return: List of text chunk strings.
     """
+    step = chunk_size - overlap
+    spans = _single_spaced_word_spans(text)
+    if spans is not None:
+        # Cleaned text: slice each chunk straight out of `text`, no per-token strings
+        starts, ends = spans
+        first = np.arange(0, len(starts), step)
+        last = np.minimum(first + chunk_size, len(starts)) - 1
+        return [text[a:b] for a, b in zip(starts[first].tolist(), ends[last].tolist())]
+
     tokens = text.split()
+    return [" ".join(tokens[start:start + chunk_size]) for start in range(0, len(tokens), step)]
+
+
+def _single_spaced_word_spans(text: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Character (start, end) offsets of every word when `text` is ASCII words
+    separated by single spaces, as produced by clean_text(); otherwise None.
+    """
+    if not text or not text.isascii():
+        return None
+    buf = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    ws = _ASCII_WS[buf]
+    spaces = np.flatnonzero(ws)
+    if ws[0] or ws[-1] or (buf[spaces] != 32).any() or (np.diff(spaces) == 1).any():
+        return None
+    return np.concatenate(([0], spaces + 1)), np.append(spaces, len(text))
+
+
+def prepare_chunks(text: str, chunk_size: int = 512, overlap: int = 50) -> List[Tuple[str, bytes]]:
+    """
+    Clean, chunk and fingerprint text in a single tokenization pass.
+
+    Produces the same chunks as ``chunk_text(clean_text(text), chunk_size, overlap)``
+    and pairs each chunk with a 16-byte BLAKE2b digest usable for deduplication.
+    ASCII input is split directly, skipping the intermediate cleaned string;
+    text containing non-ASCII characters still builds one substituted copy.
+
+    :param text: Raw input text.
+    :param chunk_size: Max words per chunk.
+    :param overlap: Number of words to overlap between consecutive chunks.
+    :return: List of (chunk, digest) tuples.
+    """
+    # Non-ASCII runs act as separators exactly as in clean_text()
+    tokens = (text if text.isascii() else _NON_ASCII_RE.sub(' ', text)).split()
     chunks = []
     start = 0
 
     while start < len(tokens):
-        end = start + chunk_size
-        chunk = " ".join(tokens[start:end])
-        chunks.append(chunk)
+        chunk = " ".join(tokens[start:start + chunk_size])
+        chunks.append((chunk, hashlib.blake2b(chunk.encode("ascii"), digest_size=16).digest()))
         start += chunk_size - overlap
 
     return chunks
 
 
+def content_digest(text: str, digest_size: int = 16) -> bytes:
+    """
+    Stable BLAKE2b digest of a text, used to derive default vector IDs.
+    Unlike the builtin hash(), it is identical across processes and runs.
+
+    :param text: Input text.
+    :param digest_size: Digest length in bytes (1-64).
+    :return: Raw digest bytes.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=digest_size).digest()
+
+
 def chunk_text_sentences(
     text: str,
     max_tokens: int = 400,
@@ -72,7 +135,7 @@ def chunk_text_sentences(
     >>> # Returns ["Alice is smart. Bob is kind.", "Bob is kind. Charlie leads."]
     """
     # Split on sentence-ending punctuation, keeping the delimiter
-    raw_sentences = re.split(r'(?<=[.!?])\s+', text.strip())
+    raw_sentences = _SENTENCE_BREAK_RE.split(text.strip())
     # Filter out empty strings
     sentences = [s.strip() for s in raw_sentences if s.strip()]
 
@@ -114,14 +177,25 @@ def list_files_in_dir(directory: str, extensions: List[str] = None) -> List[str]
     Lists all files in a directory filtered by extension (if provided).
 
     :param directory: Root directory path.
-    :param extensions: List of lowercase extensions to include, e.g. ['.pdf', '.txt'].
+    :param extensions: List of extensions to include, e.g. ['.pdf', '.txt'] (case-insensitive).
     :return: List of absolute file path strings.
     """
-    directory = Path(directory)
-    if not directory.exists():
+    if not os.path.isdir(directory):
         return []
 
-    if extensions:
-        return [str(f) for f in directory.glob("**/*") if f.suffix.lower() in extensions]
-    else:
-        return [str(f) for f in directory.glob("**/*") if f.is_file()]
+    ext_set = frozenset(e.lower() for e in extensions) if extensions else None
+    return list(_iter_files(os.fspath(directory), ext_set))
+
+
+def _iter_files(directory: str, ext_set: Optional[frozenset]) -> Iterator[str]:
+    """Recursive os.scandir walk; DirEntry caches the stat info pathlib would re-query."""
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path, ext_set)
+            elif entry.is_file() and (ext_set is None or os.path.splitext(entry.name)[1].lower() in ext_set):
+                yield entry.path
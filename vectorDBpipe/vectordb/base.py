@@ -37,6 +37,24 @@ class BaseVectorDatabase(ABC):
         """
         pass
 
+    def search_batch(self, query_embeddings: List[List[float]], top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Search several query vectors at once.
+        The default implementation issues one search() per query; backends with a
+        native multi-query API should override it.
+        :param query_embeddings: Sequence of query vectors.
+        :param top_k: The number of results to return per query.
+        :return: One result list (as returned by search()) per query, in order.
+        """
+        return [self.search(q, top_k=top_k) for q in query_embeddings]
+
+    def flush(self):
+        """
+        Persist any buffered writes.
+        No-op by default; backends that defer disk writes (e.g. FAISS) override it.
+        """
+        pass
+
     @abstractmethod
     def get_collection_info(self) -> Dict[str, Any]:
         """
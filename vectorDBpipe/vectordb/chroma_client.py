@@ -1,7 +1,10 @@
 import logging
 import chromadb
+from itertools import repeat
 from typing import List, Dict, Any
 from vectorDBpipe.vectordb.base import BaseVectorDatabase
+from vectorDBpipe.vectordb.query_cache import QueryCache, cached_search, clears_query_cache
+from vectorDBpipe.utils.common import content_digest
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +16,7 @@ class ChromaDatabase(BaseVectorDatabase):
 
     def __init__(self, collection_name: str, mode: str = "local", api_key: str = None, save_dir: str = "./data", **kwargs):
         self.collection_name = collection_name
+        self._query_cache = QueryCache.from_options(kwargs)
         
         if mode == "local":
             import os
@@ -38,10 +42,11 @@ class ChromaDatabase(BaseVectorDatabase):
 
         self.collection = self.client.get_or_create_collection(name=self.collection_name)
 
+    @clears_query_cache
     def add(self, embeddings: List[List[float]], documents: List[str], metadata: List[Dict[str, Any]], ids: List[str] = None):
         if not ids:
             # Generate deterministic string IDs if none provided
-            ids = [f"doc_{i}_{hash(doc)}" for i, doc in enumerate(documents)]
+            ids = [f"doc_{i}_{content_digest(doc, 8).hex()}" for i, doc in enumerate(documents)]
             
         try:
             self.collection.add(
@@ -55,23 +60,25 @@ class ChromaDatabase(BaseVectorDatabase):
             logger.error(f"Failed to add vectors to ChromaDB: {e}")
             raise
 
+    @cached_search
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
         results = self.collection.query(
             query_embeddings=[query_embedding],
             n_results=top_k
         )
         
-        formatted_results = []
-        # Chroma query returns a dict of lists
-        if results and results.get("ids", [[]])[0]:
-            for i in range(len(results["ids"][0])):
-                formatted_results.append({
-                    "id": results["ids"][0][i],
-                    "document": results["documents"][0][i] if "documents" in results else None,
-                    "metadata": results["metadatas"][0][i] if "metadatas" in results else {},
-                    "score": results["distances"][0][i] if "distances" in results else None
-                })
-        return formatted_results
+        # Chroma query returns a dict of lists (one inner list per query); fields
+        # left out of the response come back missing or None and are padded here.
+        if not results or not results.get("ids", [[]])[0]:
+            return []
+        ids = results["ids"][0]
+        docs = (results.get("documents") or [None])[0] or repeat(None)
+        metas = (results.get("metadatas") or [None])[0] or [{} for _ in ids]
+        dists = (results.get("distances") or [None])[0] or repeat(None)
+        return [
+            {"id": i, "document": d, "metadata": m, "score": sc}
+            for i, d, m, sc in zip(ids, docs, metas, dists)
+        ]
 
     def get_collection_info(self) -> Dict[str, Any]:
         return {
@@ -1,89 +1,542 @@
+import json
 import logging
-import faiss
+import mmap
 import numpy as np
 import pickle
 import os
+import warnings
 from typing import List, Dict, Any
 from vectorDBpipe.vectordb.base import BaseVectorDatabase
+from vectorDBpipe.vectordb.query_cache import QueryCache, cached_search, clears_query_cache
+from vectorDBpipe.vectordb import faiss_io
+
+try:
+    import faiss
+except ImportError:  # exact search falls back to _NumpyFlatIndex
+    faiss = None
+
+try:
+    import orjson
+except ImportError:  # optional — stdlib json is used instead
+    orjson = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # optional — numpy matmul is used instead
+    njit = None
 
 logger = logging.getLogger(__name__)
 
+# GPU index classes only exist in faiss-gpu builds
+if faiss is not None:
+    _FLAT_TYPES = (faiss.IndexFlat,) + ((faiss.GpuIndexFlat,) if hasattr(faiss, "GpuIndexFlat") else ())
+    _IVF_TYPES = (faiss.IndexIVF,) + ((faiss.GpuIndexIVF,) if hasattr(faiss, "GpuIndexIVF") else ())
+    _HNSW_TYPES = (faiss.IndexHNSW,)
+else:
+    _FLAT_TYPES = _IVF_TYPES = _HNSW_TYPES = ()
+
+
+def _normalize_L2(matrix: np.ndarray):
+    """In-place row normalization of a C-contiguous float32 matrix."""
+    if faiss is not None:
+        faiss.normalize_L2(matrix)
+        return
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True)
+    def _inner_products(xb, xq):
+        scores = np.empty((xq.shape[0], xb.shape[0]), dtype=np.float32)
+        for i in prange(xb.shape[0]):
+            for q in range(xq.shape[0]):
+                s = np.float32(0.0)
+                for j in range(xb.shape[1]):
+                    s += xb[i, j] * xq[q, j]
+                scores[q, i] = s
+        return scores
+else:
+    def _inner_products(xb, xq):
+        return xq @ xb.T
+
+
+class _NumpyFlatIndex:
+    """
+    Exact inner-product index used when faiss is not installed.
+    Implements the subset of the IndexFlatIP API FaissDatabase relies on.
+    """
+
+    def __init__(self, d: int, vectors: np.ndarray = None):
+        self.d = d
+        self._data = np.empty((0, d), dtype=np.float32) if vectors is None else np.ascontiguousarray(vectors, dtype=np.float32)
+        self.ntotal = len(self._data)
+
+    def reserve(self, n: int):
+        if n > len(self._data):
+            grown = np.empty((n, self.d), dtype=np.float32)
+            grown[:self.ntotal] = self._data[:self.ntotal]
+            self._data = grown
+
+    def add(self, x: np.ndarray):
+        n = len(x)
+        if self.ntotal + n > len(self._data):
+            # Grow geometrically so repeated adds stay amortized O(n)
+            self.reserve(max(2 * len(self._data), self.ntotal + n))
+        self._data[self.ntotal:self.ntotal + n] = x
+        self.ntotal += n
+
+    def reconstruct_n(self, i0: int, n: int) -> np.ndarray:
+        return self._data[i0:i0 + n].copy()
+
+    def search(self, xq: np.ndarray, k: int):
+        nq = len(xq)
+        distances = np.full((nq, k), -np.inf, dtype=np.float32)
+        labels = np.full((nq, k), -1, dtype=np.int64)
+        kk = min(k, self.ntotal)
+        if kk == 0:
+            return distances, labels
+        scores = _inner_products(self._data[:self.ntotal], xq)
+        top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        labels[:, :kk] = np.take_along_axis(top, order, axis=1)
+        distances[:, :kk] = np.take_along_axis(top_scores, order, axis=1)
+        return distances, labels
+
+
+def _json_default(obj):
+    if hasattr(obj, "tolist"):  # numpy arrays and scalars
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_line(entry: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        # NON_STR_KEYS keeps parity with json.dumps for int/float metadata keys
+        return orjson.dumps(
+            entry, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        )
+    return json.dumps(entry, default=_json_default).encode("utf-8") + b"\n"
+
+
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
 class FaissDatabase(BaseVectorDatabase):
     """
     Local Vector Database implementation using Facebook AI Similarity Search (FAISS).
     Fast, offline, and purely memory-based (with disk persistence).
+
+    Vectors are L2-normalized and searched by inner product, so scores are
+    cosine similarity (higher is better), matching the Pinecone/Qdrant backends.
+
+    index_type selects the FAISS index:
+      - "flat"    : exact brute-force search (default).
+      - "hnsw"    : IndexHNSWFlat graph index, sublinear search, no training.
+                    Built with efConstruction=`hnsw_ef_construction`; queries
+                    use efSearch=`hnsw_ef_search` unless `ef_search` is passed.
+      - "ivfflat" : IndexIVFFlat. Starts flat and is rebuilt as IVF once
+                    `ivf_train_size` vectors are stored (nlist defaults to
+                    4 * sqrt(N)). Queries probe `nprobe` lists.
+
+    quantization="binary" stores one sign bit per dimension in an
+    IndexBinaryFlat (d/8 bytes per vector instead of 4*d) and ranks by Hamming
+    distance; scores are then the fraction of matching bits. Requires
+    index_type="flat" and a dimension divisible by 8.
+
+    device="gpu" keeps flat/IVF indexes on CUDA device `gpu_id` (faiss-gpu
+    only; falls back to CPU with a warning otherwise). Indexes are copied back
+    to CPU for writing, so files stay portable.
+
+    Without faiss installed, an exact numpy index (Numba-compiled when numba
+    is available) is used instead; only flat search is available then and the
+    vectors are persisted as `<collection>.npy`.
+
+    reserve=N pre-sizes the flat vector storage (flat, HNSW and the flat
+    stage of "ivfflat") for N vectors, so adds up to that size never trigger
+    the 2x reallocation copy of a growing buffer.
+
+    read_only=True memory-maps an existing index (IO_FLAG_MMAP_IFC /
+    IO_FLAG_MMAP) so pages are shared with the OS page cache instead of
+    copied onto the heap; add() then raises and save()/flush() do nothing.
+
+    query_cache_size > 0 enables an LRU of recent query results (see
+    query_cache.QueryCache); it is cleared on every add().
+
+    Writes are deferred: add() appends metadata to a JSONL sidecar and only
+    rewrites the index on flush(), or automatically once `flush_every` vectors
+    have been added since the last flush (0 = explicit flush() only).
+    Callers must flush() or close() (or use the instance as a context manager)
+    before exiting: vectors added since the last flush are not on disk, and
+    reopening the collection drops their sidecar rows to match the index.
     """
 
-    def __init__(self, collection_name: str, mode: str = "local", api_key: str = None, dimension: int = 384, save_dir: str = "./data", **kwargs):
+    INDEX_TYPES = ("flat", "hnsw", "ivfflat")
+    QUANTIZATIONS = ("none", "binary")
+
+    def __init__(self, collection_name: str, mode: str = "local", api_key: str = None, dimension: int = 384, save_dir: str = "./data",
+                 index_type: str = "flat", hnsw_m: int = 32, hnsw_ef_construction: int = 200, hnsw_ef_search: int = 64, nlist: int = None, nprobe: int = 16, ivf_train_size: int = 10000,
+                 flush_every: int = 0, quantization: str = "none", device: str = "cpu", gpu_id: int = 0,
+                 gpu_temp_memory_mb: int = 256, read_only: bool = False, reserve: int = 0, **kwargs):
         self.collection_name = collection_name
+        self._query_cache = QueryCache.from_options(kwargs)
         self.save_dir = save_dir
-        self.dimension = dimension
-        
-        self.index_path = os.path.join(self.save_dir, f"{collection_name}.index")
-        self.meta_path = os.path.join(self.save_dir, f"{collection_name}_meta.pkl")
+        self.dimension = int(dimension)
+
+        index_type = str(index_type).lower()
+        if index_type not in self.INDEX_TYPES:
+            raise ValueError(f"Unknown index_type '{index_type}'. Choose one of {self.INDEX_TYPES}.")
+        if faiss is None and index_type != "flat":
+            logger.warning(f"faiss is not installed; using exact numpy search instead of '{index_type}'.")
+            index_type = "flat"
+        self.index_type = index_type
+
+        quantization = str(quantization or "none").lower()
+        if quantization not in self.QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization '{quantization}'. Choose one of {self.QUANTIZATIONS}.")
+        if quantization == "binary" and faiss is None:
+            raise ValueError("Binary quantization requires faiss.")
+        if quantization == "binary" and (index_type != "flat" or self.dimension % 8):
+            raise ValueError("Binary quantization needs index_type='flat' and a dimension divisible by 8.")
+        self.quantization = quantization
+        self.hnsw_m = int(hnsw_m)
+        self.hnsw_ef_construction = int(hnsw_ef_construction)
+        self.hnsw_ef_search = int(hnsw_ef_search)
+        self.nlist = int(nlist) if nlist else None
+        self.nprobe = int(nprobe)
+        self.ivf_train_size = int(ivf_train_size)
+        self.flush_every = int(flush_every)
+        self.read_only = bool(read_only)
+        self.reserve = int(reserve or 0)
+        self._dirty_since_flush = 0
+        self.gpu_id = int(gpu_id)
+        self._gpu_res = self._init_gpu(str(device).lower(), gpu_temp_memory_mb)
+        self.device = "gpu" if self._gpu_res is not None else "cpu"
+
+        index_ext = "index" if faiss is not None else "npy"
+        self.index_path = os.path.join(self.save_dir, f"{collection_name}.{index_ext}")
+        self.meta_path = os.path.join(self.save_dir, f"{collection_name}_meta.jsonl")
+        self.legacy_meta_path = os.path.join(self.save_dir, f"{collection_name}_meta.pkl")
 
         os.makedirs(self.save_dir, exist_ok=True)
         self._load_or_initialize()
 
+    def _init_gpu(self, device: str, temp_memory_mb: int):
+        """Return StandardGpuResources for device="gpu", or None to stay on CPU."""
+        supported = self.quantization != "binary" and self.index_type != "hnsw"
+        return faiss_io.gpu_resources(device, supported, f"{self.index_type}/{self.quantization}", temp_memory_mb)
+
+    def _to_device(self, index):
+        return faiss_io.to_device(self._gpu_res, self.gpu_id, index)
+
+    def _reserve_capacity(self, index):
+        """Grow the index's code buffer to `self.reserve` vectors up front, keeping its contents."""
+        if self.reserve <= index.ntotal:
+            return
+        if isinstance(index, _NumpyFlatIndex):
+            index.reserve(self.reserve)
+            return
+        storage = faiss.downcast_index(index.storage) if isinstance(index, _HNSW_TYPES) else index
+        codes = getattr(storage, "codes", None)
+        if codes is None or not hasattr(codes, "resize"):
+            return  # e.g. binary indexes, which keep vectors elsewhere
+        # The swig vector has no reserve(); growing then shrinking keeps the capacity
+        used = storage.ntotal * storage.code_size
+        codes.resize(self.reserve * storage.code_size)
+        codes.resize(used)
+
     def _load_or_initialize(self):
-        if os.path.exists(self.index_path) and os.path.exists(self.meta_path):
+        if os.path.exists(self.index_path) and (os.path.exists(self.meta_path) or os.path.exists(self.legacy_meta_path)):
             logger.info(f"Loading existing FAISS index from {self.index_path}")
-            self.index = faiss.read_index(self.index_path)
-            with open(self.meta_path, "rb") as f:
-                self.metadata_store = pickle.load(f)
+            self.index = self._read_index()
+            if faiss is not None and self.quantization != "binary" and self.index.metric_type == faiss.METRIC_L2:
+                self.index = self._migrate_l2_index(self.index)
+            if isinstance(self.index, _HNSW_TYPES):
+                self.index.hnsw.efSearch = self.hnsw_ef_search
+            if not self.read_only:
+                self._reserve_capacity(self.index)
+            self.index = self._to_device(self.index)
+            self._set_metadata(self._read_metadata())
+            # Rows appended after the last flush have no vectors in the saved index
+            if len(self._docs) != self.index.ntotal:
+                ntotal = self.index.ntotal
+                del self._docs[ntotal:], self._metas[ntotal:], self._ids[ntotal:]
+                self._write_metadata()
+        elif self.read_only:
+            raise FileNotFoundError(f"No saved FAISS collection '{self.collection_name}' in {self.save_dir} to open read-only.")
         else:
-            logger.info(f"Initializing new FAISS index of dimension {self.dimension}")
-            self.index = faiss.IndexFlatL2(self.dimension)
-            self.metadata_store = [] # List storing dictionaries containing document and metadata
+            logger.info(f"Initializing new FAISS {self.index_type} index of dimension {self.dimension}")
+            index = self._new_index()
+            self._reserve_capacity(index)
+            self.index = self._to_device(index)
+            self._set_metadata([])
+            self._write_metadata()
 
-    def save(self):
-        faiss.write_index(self.index, self.index_path)
+    def _migrate_l2_index(self, index):
+        """
+        Collections saved before the switch to cosine used IndexFlatL2; rebuild
+        them as IndexFlatIP over normalized vectors so scores keep meaning
+        "higher is better".
+        """
+        if not isinstance(index, _FLAT_TYPES):
+            raise ValueError(
+                f"FAISS collection '{self.collection_name}' uses an L2 {type(index).__name__} index; "
+                "only flat L2 indexes can be migrated to cosine similarity. Re-ingest the collection."
+            )
+        logger.info(f"Migrating FAISS collection {self.collection_name} from L2 to cosine (inner product).")
+        vectors = np.ascontiguousarray(index.reconstruct_n(0, index.ntotal), dtype=np.float32)
+        _normalize_L2(vectors)
+        migrated = faiss.IndexFlatIP(index.d)
+        migrated.add(vectors)
+        if not self.read_only:
+            faiss.write_index(migrated, self.index_path)
+        return migrated
+
+    def _read_metadata(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.meta_path):
+            # Collections saved before the JSONL sidecar: migrate the pickle once
+            with open(self.legacy_meta_path, "rb") as f:
+                entries = pickle.load(f)
+            self._set_metadata(entries)
+            self._write_metadata()
+            return entries
+        with open(self.meta_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            # Map the sidecar instead of buffering it through Python file reads
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return [_loads(line) for line in iter(mm.readline, b"") if line.strip()]
+
+    def _write_metadata(self):
+        """Rewrite the whole metadata sidecar from memory."""
+        if self.read_only:
+            return
         with open(self.meta_path, "wb") as f:
-            pickle.dump(self.metadata_store, f)
+            f.write(b"".join(_dumps_line(entry) for entry in self.metadata_store))
+
+    def _set_metadata(self, entries: List[Dict[str, Any]]):
+        # Struct-of-arrays: row i of the index ↔ _docs[i], _metas[i], _ids[i]
+        self._docs = [e.get("document") for e in entries]
+        self._metas = [e.get("metadata") for e in entries]
+        self._ids = [e.get("id") for e in entries]
+
+    @property
+    def metadata_store(self) -> List[Dict[str, Any]]:
+        """Per-row {document, metadata, id} dicts, assembled on demand from the column lists."""
+        return [
+            {"document": d, "metadata": m, "id": i}
+            for d, m, i in zip(self._docs, self._metas, self._ids)
+        ]
+
+    def _append_metadata(self, payload: bytes):
+        with open(self.meta_path, "ab") as f:
+            f.write(payload)
+
+    def _read_index(self):
+        if faiss is None:
+            return _NumpyFlatIndex(self.dimension, np.load(self.index_path, mmap_mode="r" if self.read_only else None))
+        index, _ = faiss_io.read_index(self.index_path, mmap=self.read_only, binary=self.quantization == "binary")
+        return index
+
+    def _write_index(self):
+        if faiss is None:
+            np.save(self.index_path, self.index.reconstruct_n(0, self.index.ntotal))
+        elif self.quantization == "binary":
+            faiss.write_index_binary(self.index, self.index_path)
+        else:
+            faiss.write_index(faiss_io.to_cpu(self._gpu_res, self.index), self.index_path)
+
+    @staticmethod
+    def _binarize(vectors: np.ndarray) -> np.ndarray:
+        """Sign-quantize float vectors into packed bits (one uint8 per 8 dims)."""
+        return np.packbits(vectors > 0, axis=1)
+
+    def _new_index(self):
+        if faiss is None:
+            return _NumpyFlatIndex(self.dimension)
+        if self.quantization == "binary":
+            return faiss.IndexBinaryFlat(self.dimension)
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(self.dimension, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = self.hnsw_ef_construction
+            index.hnsw.efSearch = self.hnsw_ef_search
+            return index
+        # IVF needs training data, so "ivfflat" starts out flat (see _maybe_build_ivf)
+        return faiss.IndexFlatIP(self.dimension)
+
+    def _maybe_build_ivf(self):
+        """Rebuild a flat index as IndexIVFFlat once enough vectors exist to train it."""
+        if self.index_type != "ivfflat" or not isinstance(self.index, _FLAT_TYPES):
+            return
+        ntotal = self.index.ntotal
+        if ntotal < self.ivf_train_size:
+            return
+
+        nlist = self.nlist or int(4 * np.sqrt(ntotal))
+        nlist = max(1, min(nlist, ntotal))
+        vectors = self.index.reconstruct_n(0, ntotal)
+        quantizer = faiss.IndexFlatIP(self.dimension)
+        ivf = faiss.IndexIVFFlat(quantizer, self.dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+        ivf.train(vectors)
+        ivf.add(vectors)
+        self.index = self._to_device(ivf)
+        logger.info(f"Rebuilt FAISS collection {self.collection_name} as IVF (nlist={nlist}, {ntotal} vectors).")
+
+    def save(self):
+        """Write the index and a compacted copy of the metadata sidecar."""
+        if self.read_only:
+            return
+        self._write_index()
+        self._write_metadata()
+        self._dirty_since_flush = 0
         logger.debug(f"Saved FAISS index to {self.index_path}")
 
+    def flush(self):
+        """Write the index to disk if vectors were added since the last flush."""
+        if self.read_only:
+            return
+        if not self._dirty_since_flush:
+            return
+        self._write_index()
+        self._dirty_since_flush = 0
+        logger.debug(f"Flushed FAISS index to {self.index_path}")
+
+    def close(self):
+        """Flush pending vectors to disk; safe to call more than once."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # Warn only: flushing from a finalizer could overwrite files a newer instance has reopened
+        if getattr(self, "_dirty_since_flush", 0):
+            warnings.warn(
+                f"FaissDatabase({self.collection_name!r}) was discarded with "
+                f"{self._dirty_since_flush} unflushed vectors; call flush() or close()",
+                ResourceWarning, stacklevel=2,
+            )
+
+    @clears_query_cache
     def add(self, embeddings: List[List[float]], documents: List[str], metadata: List[Dict[str, Any]], ids: List[str] = None):
-        if not embeddings:
+        if self.read_only:
+            raise RuntimeError(f"FAISS collection '{self.collection_name}' was opened read-only.")
+        if len(embeddings) == 0:
             return
 
-        vector_array = np.array(embeddings).astype("float32")
-        self.index.add(vector_array)
-        
-        # Store metadata aligned with FAISS internal index
-        for i in range(len(embeddings)):
-            self.metadata_store.append({
-                "document": documents[i],
-                "metadata": metadata[i] if len(metadata) > i else {},
-                "id": ids[i] if ids and len(ids) > i else None
-            })
-            
-        self.save()
+        vector_array = self._prepare_vectors(embeddings)
+
+        # Metadata aligned with FAISS internal index; short metadata/ids are padded.
+        # Encode it before touching the index so a serialization error leaves both untouched
+        n = len(vector_array)
+        docs = list(documents[:n]) + [None] * (n - len(documents))
+        metas = list(metadata[:n]) + [{}] * (n - len(metadata))
+        ids_iter = list(ids[:n]) + [None] * (n - len(ids)) if ids else [None] * n
+        payload = b"".join(
+            _dumps_line({"document": d, "metadata": m, "id": i})
+            for d, m, i in zip(docs, metas, ids_iter)
+        )
+
+        if self.quantization == "binary":
+            self.index.add(self._binarize(vector_array))
+        else:
+            self.index.add(vector_array)
+        self._maybe_build_ivf()
+
+        self._docs.extend(docs)
+        self._metas.extend(metas)
+        self._ids.extend(ids_iter)
+        self._append_metadata(payload)
+
+        self._dirty_since_flush += n
+        if self.flush_every > 0 and self._dirty_since_flush >= self.flush_every:
+            self.flush()
         logger.info(f"Added {len(embeddings)} vectors to FAISS collection {self.collection_name}.")
 
-    def search(self, query_embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
+    @cached_search
+    def search(self, query_embedding: List[float], top_k: int = 5, ef_search: int = None) -> List[Dict[str, Any]]:
         if self.index.ntotal == 0:
             return []
 
         # FAISS expects 2D array: (1, dim)
-        query_vector = np.array([query_embedding]).astype("float32")
-        distances, indices = self.index.search(query_vector, top_k)
-
-        results = []
-        for i, idx in enumerate(indices[0]):
-            if idx != -1 and idx < len(self.metadata_store): # -1 means not enough results
-                meta_info = self.metadata_store[idx]
-                results.append({
-                    "id": meta_info.get("id"),
-                    "document": meta_info.get("document"),
-                    "metadata": meta_info.get("metadata"),
-                    "score": float(distances[0][i]) # L2 distance (lower is better)
-                })
-        return results
+        query_vector = self._prepare_vectors(query_embedding)
+        return self._search_matrix(query_vector, top_k, ef_search)[0]
+
+    def search_batch(self, query_embeddings: List[List[float]], top_k: int = 5, ef_search: int = None) -> List[List[Dict[str, Any]]]:
+        if len(query_embeddings) == 0:
+            return []
+        if self.index.ntotal == 0:
+            return [[] for _ in range(len(query_embeddings))]
+
+        # One (nq, dim) matrix → a single FAISS call for every query
+        query_matrix = self._prepare_vectors(query_embeddings)
+        return self._search_matrix(query_matrix, top_k, ef_search)
+
+    def _prepare_vectors(self, vectors) -> np.ndarray:
+        """
+        Return `vectors` as a C-contiguous (n, dim) float32 matrix, L2-normalized
+        unless the index is binary. Copies only when needed: a float32 ndarray
+        that is already unit-norm is used as-is, and the caller's array is never
+        normalized in place.
+        """
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dimension:
+            raise ValueError(f"Expected vectors of dimension {self.dimension}, got shape {matrix.shape}.")
+        if self.quantization == "binary":
+            return matrix
+        if isinstance(vectors, np.ndarray) and np.shares_memory(matrix, vectors):
+            sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+            if np.allclose(sq_norms, 1.0, atol=1e-4):
+                return matrix
+            matrix = matrix.copy()
+        _normalize_L2(matrix)
+        return matrix
+
+    def _search_matrix(self, query_matrix: np.ndarray, top_k: int, ef_search: int = None) -> List[List[Dict[str, Any]]]:
+        if isinstance(self.index, _IVF_TYPES):
+            self.index.nprobe = self.nprobe
+        if self.quantization == "binary":
+            distances, indices = self.index.search(self._binarize(query_matrix), top_k)
+            # Hamming distance → fraction of agreeing bits, so higher is still better
+            distances = 1.0 - distances / self.dimension
+        elif ef_search and isinstance(self.index, _HNSW_TYPES):
+            # Per-call override; the index's own efSearch is left untouched
+            params = faiss.SearchParametersHNSW(efSearch=int(ef_search))
+            distances, indices = self.index.search(query_matrix, top_k, params=params)
+        else:
+            distances, indices = self.index.search(query_matrix, top_k)
+
+        # tolist() converts scores/ids to Python scalars in one C pass instead of per element
+        docs, metas, ids = self._docs, self._metas, self._ids
+        n = len(docs)
+        return [
+            [
+                {
+                    "id": ids[idx],
+                    "document": docs[idx],
+                    "metadata": metas[idx],
+                    "score": score,  # cosine similarity (higher is better)
+                }
+                for score, idx in zip(row_distances, row_indices)
+                if -1 < idx < n  # -1 means not enough results
+            ]
+            for row_distances, row_indices in zip(distances.tolist(), indices.tolist())
+        ]
 
     def get_collection_info(self) -> Dict[str, Any]:
         return {
             "name": self.collection_name,
             "total_vectors": getattr(self.index, 'ntotal', 0),
             "dimension": self.dimension,
+            "index_type": self.index_type,
+            "quantization": self.quantization,
+            "device": self.device,
             "provider": "faiss"
         }
@@ -0,0 +1,66 @@
+"""
+FAISS index I/O and device placement shared by FaissDatabase and FaissVectorStore.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+try:
+    import faiss
+except ImportError:  # callers check for faiss themselves
+    faiss = None
+
+logger = logging.getLogger(__name__)
+
+GPU_DEVICES = ("gpu", "cuda")
+
+
+def read_index(path: str, mmap: bool = False, binary: bool = False) -> Tuple[object, bool]:
+    """
+    Read a FAISS index, memory-mapped read-only when `mmap` is set.
+    Returns (index, mapped); falls back to an in-memory read when the index
+    type cannot be mapped.
+    """
+    read_fn = faiss.read_index_binary if binary else faiss.read_index
+    if mmap:
+        # MMAP_IFC maps flat codes directly (newer faiss); MMAP covers IVF lists
+        mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+        try:
+            return read_fn(path, mmap_flag | faiss.IO_FLAG_READ_ONLY), True
+        except RuntimeError as e:
+            logger.warning(f"Could not memory-map {path} ({e}); reading it into memory.")
+    return read_fn(path), False
+
+
+def gpu_resources(device: str, supported: bool = True, description: str = "this index",
+                  temp_memory_mb: Optional[int] = None):
+    """
+    Return StandardGpuResources when `device` asks for a GPU and one is usable,
+    or None (with a warning if a GPU was requested) to stay on CPU.
+    """
+    if str(device).lower() not in GPU_DEVICES:
+        return None
+    if faiss is None or not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+        logger.warning(f"device='{device}' requested but no FAISS GPU support is available; using CPU.")
+        return None
+    if not supported:
+        logger.warning(f"FAISS {description} indexes are not supported on GPU; using CPU.")
+        return None
+    res = faiss.StandardGpuResources()
+    if temp_memory_mb is not None:
+        res.setTempMemory(int(temp_memory_mb) * 1024 * 1024)
+    return res
+
+
+def to_device(gpu_res, gpu_id: int, index):
+    """Clone `index` onto GPU `gpu_id`; a no-op without GPU resources."""
+    if gpu_res is None:
+        return index
+    return faiss.index_cpu_to_gpu(gpu_res, gpu_id, index)
+
+
+def to_cpu(gpu_res, index):
+    """CPU copy of a GPU index for writing; CPU indexes are returned as-is."""
+    if gpu_res is None:
+        return index
+    return faiss.index_gpu_to_cpu(index)
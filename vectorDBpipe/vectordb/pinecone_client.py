@@ -1,11 +1,22 @@
 import logging
+import os
+import threading
+import time
 import pinecone
+from concurrent.futures import ThreadPoolExecutor
 from pinecone import Pinecone, ServerlessSpec
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set, Tuple
 from vectorDBpipe.vectordb.base import BaseVectorDatabase
+from vectorDBpipe.vectordb.query_cache import QueryCache, cached_search, clears_query_cache
+from vectorDBpipe.utils.common import content_digest
 
 logger = logging.getLogger(__name__)
 
+# Index names seen per API key (keyed by a digest, never the raw key): fingerprint → (fetched_at, names)
+_INDEX_CACHE: Dict[str, Tuple[float, Set[str]]] = {}
+_INDEX_CACHE_LOCK = threading.Lock()
+_INDEX_CACHE_TTL = 60.0
+
 class PineconeDatabase(BaseVectorDatabase):
     """
     Vector Database implementation using Pinecone.
@@ -14,12 +25,15 @@ class PineconeDatabase(BaseVectorDatabase):
 
     def __init__(self, collection_name: str, mode: str = "cloud", api_key: str = None, dimension: int = 1024, **kwargs):
         self.collection_name = collection_name
+        self._query_cache = QueryCache.from_options(kwargs)
         self.dimension = int(dimension)
         
         self.metric = kwargs.get("metric", "cosine")
         self.cloud = kwargs.get("cloud", "aws")
         self.region = kwargs.get("region", kwargs.get("environment", "us-east-1"))
         self.capacity_mode = kwargs.get("capacity_mode", "serverless")
+        # Number of 100-vector upsert batches kept in flight at once
+        self.upsert_workers = max(1, int(kwargs.get("upsert_workers", 8)))
         
         if mode != "cloud":
             logger.warning("Pinecone only supports 'cloud' mode. Forcing mode='cloud'.")
@@ -30,13 +44,28 @@ class PineconeDatabase(BaseVectorDatabase):
 
         logger.info(f"Connecting to Pinecone Cloud (Region: {self.region})")
         self.pc = Pinecone(api_key=api_key)
+        self._key_fingerprint = content_digest(api_key, 8).hex()
         
         self._ensure_index()
         self.index = self.pc.Index(self.collection_name)
 
+    def _existing_indexes(self) -> Set[str]:
+        """Index names for this API key, re-listed at most once per _INDEX_CACHE_TTL seconds."""
+        with _INDEX_CACHE_LOCK:
+            cached = _INDEX_CACHE.get(self._key_fingerprint)
+            if cached and time.monotonic() - cached[0] < _INDEX_CACHE_TTL:
+                return cached[1]
+        names = {index_info["name"] for index_info in self.pc.list_indexes()}
+        with _INDEX_CACHE_LOCK:
+            _INDEX_CACHE[self._key_fingerprint] = (time.monotonic(), names)
+        return names
+
     def _ensure_index(self):
-        existing_indexes = [index_info["name"] for index_info in self.pc.list_indexes()]
-        
+        # Deployments that provision indexes out of band can skip the control-plane call
+        if os.environ.get("VDB_SKIP_INDEX_CHECK") == "1":
+            return
+        existing_indexes = self._existing_indexes()
+
         if self.collection_name not in existing_indexes:
             logger.info(f"Creating Pinecone index: {self.collection_name} | {self.dimension}d | {self.metric} | {self.capacity_mode}")
             
@@ -53,31 +82,43 @@ class PineconeDatabase(BaseVectorDatabase):
                 metric=self.metric,
                 spec=spec
             )
+            existing_indexes.add(self.collection_name)
 
+    @clears_query_cache
     def add(self, embeddings: List[List[float]], documents: List[str], metadata: List[Dict[str, Any]], ids: List[str] = None):
         if not ids:
-            ids = [f"doc_{hash(doc)}" for doc in documents]
+            ids = [f"doc_{content_digest(doc, 8).hex()}" for doc in documents]
             
+        if hasattr(embeddings, "tolist"):  # numpy matrix → plain floats for the client
+            embeddings = embeddings.tolist()
+
         vectors_to_upsert = []
         for i in range(len(embeddings)):
-            meta = metadata[i] if metadata and len(metadata) > i else {}
+            # Copy: metadata dicts may be shared between chunks of one source
+            meta = dict(metadata[i]) if metadata and len(metadata) > i else {}
             meta["text"] = documents[i] 
             vectors_to_upsert.append(
                 {"id": str(ids[i]), "values": embeddings[i], "metadata": meta}
             )
 
         try:
-            # Upsert in batches of 100 to respect Pinecone limits
+            # Upsert in batches of 100 to respect Pinecone limits; batches are
+            # network-bound, so several round-trips are kept in flight at once.
             batch_size = 100
-            for i in range(0, len(vectors_to_upsert), batch_size):
-                batch = vectors_to_upsert[i:i + batch_size]
-                self.index.upsert(vectors=batch)
-                
+            batches = [vectors_to_upsert[i:i + batch_size] for i in range(0, len(vectors_to_upsert), batch_size)]
+            if len(batches) <= 1 or self.upsert_workers == 1:
+                for batch in batches:
+                    self.index.upsert(vectors=batch)
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.upsert_workers, len(batches))) as executor:
+                    list(executor.map(lambda batch: self.index.upsert(vectors=batch), batches))
+
             logger.info(f"Added {len(embeddings)} vectors to Pinecone index {self.collection_name}.")
         except Exception as e:
             logger.error(f"Failed to add vectors to Pinecone: {e}")
             raise
 
+    @cached_search
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
         results = self.index.query(
             vector=query_embedding,
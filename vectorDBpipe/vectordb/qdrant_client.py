@@ -1,9 +1,12 @@
 import logging
+import time
+import numpy as np
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams, PointStruct
+from qdrant_client.http.models import CollectionStatus, Distance, VectorParams
 from typing import List, Dict, Any
 from vectorDBpipe.vectordb.base import BaseVectorDatabase
-import uuid
+from vectorDBpipe.vectordb.query_cache import QueryCache, cached_search, clears_query_cache
+from vectorDBpipe.utils.common import content_digest
 
 logger = logging.getLogger(__name__)
 
@@ -11,12 +14,23 @@ class QdrantDatabase(BaseVectorDatabase):
     """
     Vector Database implementation using Qdrant.
     Supports both local persistence and cloud host connections.
+
+    Points are streamed with `upload_collection` in `upload_batch_size` chunks.
+    In cloud mode the client prefers gRPC (`prefer_grpc`) and uploads with
+    `upload_parallel` workers. With `wait=False` uploads return before Qdrant
+    applies them; call flush() to block until the collection is ready.
     """
 
     def __init__(self, collection_name: str, mode: str = "local", api_key: str = None, save_dir: str = "./data/qdrant", dimension: int = 384, **kwargs):
         self.collection_name = collection_name
+        self._query_cache = QueryCache.from_options(kwargs)
         self.dimension = dimension
-        
+        self.upload_batch_size = int(kwargs.get("upload_batch_size", 256))
+        self.wait = bool(kwargs.get("wait", True))
+        self.flush_timeout = float(kwargs.get("flush_timeout", 60.0))
+        # The embedded (path=) client runs in-process and cannot upload in parallel
+        self.upload_parallel = int(kwargs.get("upload_parallel", 4)) if mode == "cloud" else 1
+
         if mode == "local":
             logger.info(f"Connecting to Local Qdrant at {save_dir}")
             self.client = QdrantClient(path=save_dir)
@@ -28,6 +42,7 @@ class QdrantDatabase(BaseVectorDatabase):
             self.client = QdrantClient(
                 url=url,
                 api_key=api_key,
+                prefer_grpc=bool(kwargs.get("prefer_grpc", True)),
             )
         else:
             raise ValueError(f"Unknown mode '{mode}'. Choose 'local' or 'cloud'.")
@@ -43,35 +58,53 @@ class QdrantDatabase(BaseVectorDatabase):
                 vectors_config=VectorParams(size=self.dimension, distance=Distance.COSINE),
             )
 
+    @clears_query_cache
     def add(self, embeddings: List[List[float]], documents: List[str], metadata: List[Dict[str, Any]], ids: List[str] = None):
         if not ids:
-            # Qdrant requires IDs to be UUIDs or integers. We'll generate a UUID for each.
-            ids = [str(uuid.uuid4()) for _ in documents]
-            
-        points = []
-        for i in range(len(embeddings)):
-            meta = metadata[i] if metadata and len(metadata) > i else {}
-            # store the text chunk in the metadata payload
-            meta["text"] = documents[i] 
+            # Qdrant requires IDs to be UUIDs or integers. Derive them from the
+            # content so re-ingesting the same chunk overwrites instead of duplicating.
+            # A 16-byte digest in hex is already a valid (simple-form) UUID string.
+            ids = [content_digest(doc).hex() for doc in documents]
             
-            points.append(
-                PointStruct(
-                    id=ids[i],
-                    vector=embeddings[i],
-                    payload=meta
-                )
-            )
+        # upload_collection slices the matrix per batch itself, so no per-point
+        # PointStruct (and pydantic validation) is ever built.
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+        def payloads():
+            for i in range(len(vectors)):
+                # Copy: metadata dicts may be shared between chunks of one source
+                meta = dict(metadata[i]) if metadata and len(metadata) > i else {}
+                # store the text chunk in the metadata payload
+                meta["text"] = documents[i]
+                yield meta
 
         try:
-            self.client.upsert(
+            self.client.upload_collection(
                 collection_name=self.collection_name,
-                points=points
+                vectors=vectors,
+                payload=payloads(),
+                ids=ids,
+                batch_size=self.upload_batch_size,
+                parallel=self.upload_parallel,
+                wait=self.wait,
             )
             logger.info(f"Added {len(embeddings)} vectors to Qdrant collection {self.collection_name}.")
         except Exception as e:
             logger.error(f"Failed to add vectors to Qdrant: {e}")
             raise
 
+    def flush(self):
+        """With wait=False, block until Qdrant reports the collection as fully applied."""
+        if self.wait:
+            return
+        deadline = time.monotonic() + self.flush_timeout
+        while self.client.get_collection(self.collection_name).status != CollectionStatus.GREEN:
+            if time.monotonic() > deadline:
+                logger.warning(f"Qdrant collection {self.collection_name} still optimizing after {self.flush_timeout}s.")
+                return
+            time.sleep(0.1)
+
+    @cached_search
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
         results = self.client.search(
             collection_name=self.collection_name,
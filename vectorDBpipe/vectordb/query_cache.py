@@ -0,0 +1,111 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class QueryCache:
+    """
+    In-process LRU of query vector → search results.
+
+    Entries are keyed on a BLAKE2b digest of the float32 query bytes plus
+    `top_k` and any extra search kwargs. With `similarity_threshold` set, a
+    miss falls back to the most similar cached query (cosine) and reuses its
+    results if the similarity reaches the threshold.
+
+    Stores opt in with a `query_cache_size` > 0 and use the `cached_search`
+    and `clears_query_cache` decorators below.
+    """
+
+    def __init__(self, maxsize: int = 256, similarity_threshold: Optional[float] = None):
+        self.maxsize = int(maxsize)
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> Optional["QueryCache"]:
+        """Build a cache from store kwargs; None when `query_cache_size` is 0/unset."""
+        size = int(options.get("query_cache_size") or 0)
+        if size <= 0:
+            return None
+        threshold = options.get("query_cache_threshold")
+        return cls(size, float(threshold) if threshold is not None else None)
+
+    @staticmethod
+    def _key(vector: np.ndarray, top_k: int, options: Dict[str, Any]) -> tuple:
+        digest = hashlib.blake2b(vector.tobytes(), digest_size=16).digest()
+        return digest, top_k, tuple(sorted(options.items()))
+
+    def get(self, query_embedding, top_k: int, options: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        vector = np.ascontiguousarray(query_embedding, dtype=np.float32).ravel()
+        key = self._key(vector, top_k, options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[1]
+            if self.similarity_threshold is None:
+                return None
+            return self._nearest(vector, key[1:])
+
+    def _nearest(self, vector: np.ndarray, signature: tuple) -> Optional[List[Dict[str, Any]]]:
+        norm = np.linalg.norm(vector)
+        candidates = [(k, e) for k, e in self._entries.items() if k[1:] == signature and e[0].shape == vector.shape]
+        if not candidates or norm == 0:
+            return None
+        sims = np.stack([e[0] for _, e in candidates]) @ (vector / norm)
+        best = int(np.argmax(sims))
+        if sims[best] < self.similarity_threshold:
+            return None
+        key, entry = candidates[best]
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, query_embedding, top_k: int, options: Dict[str, Any], results: List[Dict[str, Any]]):
+        vector = np.ascontiguousarray(query_embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        unit = vector / norm if norm else vector
+        with self._lock:
+            self._entries[self._key(vector, top_k, options)] = (unit, results)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def cached_search(search):
+    """Serve `search(query, top_k, **kwargs)` from `self._query_cache` when enabled."""
+    @functools.wraps(search)
+    def wrapper(self, query_embedding, top_k: int = 5, **kwargs):
+        cache = getattr(self, "_query_cache", None)
+        if cache is None:
+            return search(self, query_embedding, top_k=top_k, **kwargs)
+        hit = cache.get(query_embedding, top_k, kwargs)
+        if hit is not None:
+            return [dict(r) for r in hit]  # callers may mutate result dicts
+        results = search(self, query_embedding, top_k=top_k, **kwargs)
+        cache.put(query_embedding, top_k, kwargs, [dict(r) for r in results])
+        return results
+    return wrapper
+
+
+def clears_query_cache(write):
+    """Drop cached search results after a write to the store."""
+    @functools.wraps(write)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return write(self, *args, **kwargs)
+        finally:
+            cache = getattr(self, "_query_cache", None)
+            if cache is not None:
+                cache.clear()
+    return wrapper
@@ -1,8 +1,12 @@
 # vectordb/store.py
 
 from abc import ABC, abstractmethod
+import functools
 import logging
 
+from vectorDBpipe.vectordb.query_cache import QueryCache, cached_search, clears_query_cache
+from vectorDBpipe.vectordb import faiss_io
+
 logger = logging.getLogger(__name__)
 
 
@@ -143,12 +147,101 @@ class PineconeVectorStore(BaseVectorStore):
 # Local FAISS Handler
 # =====================
 class FaissVectorStore(BaseVectorStore):
-    def __init__(self, index_path: str = "data/faiss_index"):
+    """
+    Durability modes (when inserted vectors reach disk):
+      - "manual": only on persist()/flush()/close().
+      - "batch" : additionally once `dirty_threshold` vectors are unsaved, and
+                  when the store is garbage-collected (default).
+      - "always": after every insert_vectors() call.
+
+    index_type picks the FAISS index built via index_factory:
+      "flat", "ivf_flat", "ivf_sq8", "ivf_pq" (m sub-quantizers x nbits) or
+      "hnsw" (hnsw_m links). IVF variants need training, so the store stays
+      flat until `train_size` vectors (default 256 * nlist) are stored, then
+      trains on them and migrates; below that size flat search is faster anyway.
+      Queries on IVF indexes probe `nprobe` lists.
+
+    quantize stores "flat"/"ivf_flat" vectors as "int8" (SQ8, ~4x less memory
+    bandwidth than fp32) or "fp16" (SQfp16) codes. int8 needs its value ranges
+    trained, so like IVF it stages flat until `train_size` vectors exist.
+
+    metric selects how vectors are compared and how `score` is reported:
+      - "l2"    : Euclidean distance, score = 1 / (1 + d) (default).
+      - "ip"    : raw inner product, score = <q, x>.
+      - "cosine": inner product on L2-normalized vectors, score = (cos + 1) / 2.
+      The inner-product metrics let batched queries run as a single GEMM.
+
+    mmap=True memory-maps an existing index on load (IO_FLAG_MMAP_IFC /
+    IO_FLAG_MMAP, read-only) so startup does not copy it onto the heap and
+    processes share the OS page cache. The first insert copies it into memory
+    before modifying it.
+
+    device="cuda" moves flat/IVF indexes to GPU `gpu_id` with index_cpu_to_gpu
+    (faiss-gpu only; HNSW and flat scalar-quantized indexes, or a missing GPU,
+    fall back to CPU with a warning). Indexes are copied back to CPU for
+    writing, so files stay portable. Batch queries with search_vectors_batch
+    to amortize the host/device transfers.
+
+    FAISS ids are the row's position in the metadata store, set explicitly via
+    add_with_ids (IVF indexes store ids natively, the others are wrapped in
+    IndexIDMap2), so update_vector/delete_vector remove single vectors without
+    a rebuild (HNSW excepted: FAISS cannot remove from it). Flat/HNSW indexes
+    saved before the wrapper existed are rebuilt into it on load.
+
+    insert_vectors converts and adds input in tiles of about `tile_bytes` of
+    float32 rows, so a large Python batch never materializes as one giant
+    array and each tile stays cache-resident while FAISS adds it.
+
+    num_threads sets FAISS's OpenMP pool size once, at construction, for the
+    whole process (FAISS has no per-index setting). Flat indexes parallelize
+    over queries, so latency-bound single-query services on many-core hosts
+    usually want a small value (even 1); throughput should come from
+    search_vectors_batch instead.
+    """
+
+    DURABILITY_MODES = ("manual", "batch", "always")
+    INDEX_TYPES = ("flat", "ivf_flat", "ivf_sq8", "ivf_pq", "hnsw")
+    METRICS = ("l2", "ip", "cosine")
+    QUANTIZE = {"none": "Flat", "int8": "SQ8", "fp16": "SQfp16"}
+
+    def __init__(self, index_path: str = "data/faiss_index", query_cache_size: int = 0, query_cache_threshold: float = None,
+                 durability: str = "batch", dirty_threshold: int = 10000, index_type: str = "flat",
+                 nlist: int = 1024, nprobe: int = 16, m: int = 16, nbits: int = 8, hnsw_m: int = 32, train_size: int = None,
+                 metric: str = "l2", num_threads: int = None, quantize: str = "none",
+                 mmap: bool = False, device: str = "cpu", gpu_id: int = 0, tile_bytes: int = 256 * 1024):
+        if durability not in self.DURABILITY_MODES:
+            raise ValueError(f"Unknown durability '{durability}'. Choose one of {self.DURABILITY_MODES}.")
+        if index_type not in self.INDEX_TYPES:
+            raise ValueError(f"Unknown index_type '{index_type}'. Choose one of {self.INDEX_TYPES}.")
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Choose one of {self.METRICS}.")
+        if quantize not in self.QUANTIZE:
+            raise ValueError(f"Unknown quantize '{quantize}'. Choose one of {tuple(self.QUANTIZE)}.")
+        if quantize != "none" and index_type not in ("flat", "ivf_flat"):
+            raise ValueError(f"quantize='{quantize}' applies to the 'flat' and 'ivf_flat' index types only.")
+        self.metric = metric
+        self.quantize = quantize
+        self.mmap = bool(mmap)
+        self._mapped = False
+        self.index_type = index_type
+        self.nlist = int(nlist)
+        self.nprobe = int(nprobe)
+        self.m = int(m)
+        self.nbits = int(nbits)
+        self.hnsw_m = int(hnsw_m)
+        self.train_size = int(train_size) if train_size else 256 * self.nlist
+        self.tile_bytes = int(tile_bytes)
+        self.durability = durability
+        self._dirty = 0
+        self._dirty_threshold = int(dirty_threshold)
         self.index_path = index_path
         self.metadata_path = index_path + "_metadata.pkl"
+        self.ids_path = index_path + "_ids.npy"
         self.dimension = None
         self.index = None
-        self.metadata_store = {} # Map id -> metadata
+        self._query_cache = QueryCache.from_options(
+            {"query_cache_size": query_cache_size, "query_cache_threshold": query_cache_threshold}
+        )
 
         try:
             import faiss
@@ -162,6 +255,17 @@ class FaissVectorStore(BaseVectorStore):
         self.np = np
         self.pickle = pickle
         self.os = os
+        if num_threads:
+            faiss.omp_set_num_threads(int(num_threads))
+        self.gpu_id = int(gpu_id)
+        self._gpu_res = self._init_gpu(str(device).lower())
+        self.device = "cuda" if self._gpu_res is not None else "cpu"
+        # Struct-of-arrays metadata, positioned by FAISS internal id (0..ntotal-1).
+        # Plain lists grow geometrically, so inserts stay amortized O(batch)
+        self._ids = []
+        self._meta = []
+        # user id -> internal ids stored under it, so update/delete skip a scan of _ids
+        self._id_rows = {}
 
         if self.os.path.exists(self.index_path) and self.os.path.exists(self.metadata_path):
              self.load_index()
@@ -170,104 +274,354 @@ class FaissVectorStore(BaseVectorStore):
 
     def load_index(self):
         logger.info(f"Loading FAISS index from {self.index_path}")
-        self.index = self.faiss.read_index(self.index_path)
+        index = self._read_index()
+        if not isinstance(index, (self.faiss.IndexIDMap, self.faiss.IndexIDMap2)) \
+                and self.faiss.try_extract_index_ivf(index) is None:
+            index = self._wrap_legacy(index)
+        self.index = self._to_device(index)
+        if self._gpu_res is not None:
+            self._mapped = False  # the GPU holds its own copy
+        self.dimension = self.index.d
         with open(self.metadata_path, 'rb') as f:
-            self.metadata_store = self.pickle.load(f)
+            stored = self.pickle.load(f)
+        if isinstance(stored, dict):
+            # Legacy layout: {internal_id: metadata}
+            stored = [stored.get(i, {}) for i in range(self.index.ntotal)]
+        self._meta = stored
+        if self.os.path.exists(self.ids_path):
+            self._ids = self.np.load(self.ids_path, allow_pickle=True).tolist()
+        else:
+            self._ids = [m.get("id", str(i)) for i, m in enumerate(stored)]
+        self._id_rows = {}
+        self._index_ids(0)
+
+    def _wrap_legacy(self, index):
+        """Rebuild an unwrapped index as IndexIDMap2 with ids 0..ntotal-1, its old implicit ids."""
+        logger.info(f"Upgrading {self.index_path} to an IndexIDMap2 index")
+        vectors = index.reconstruct_n(0, index.ntotal)
+        # An owned copy (not clone_index, which would keep viewing mmapped codes), emptied
+        # but still trained
+        empty = self.faiss.deserialize_index(self.faiss.serialize_index(index))
+        empty.reset()
+        wrapped = self.faiss.IndexIDMap2(empty)
+        wrapped.add_with_ids(vectors, self.np.arange(index.ntotal, dtype="int64"))
+        self._mapped = False
+        return wrapped
+
+    def _init_gpu(self, device: str):
+        """Return StandardGpuResources for device="cuda", or None to stay on CPU."""
+        supported = self.index_type != "hnsw" and not (self.index_type == "flat" and self.quantize != "none")
+        return faiss_io.gpu_resources(device, supported, f"{self.index_type}/{self.quantize}")
+
+    def _to_device(self, index):
+        return faiss_io.to_device(self._gpu_res, self.gpu_id, index)
+
+    def _read_index(self):
+        index, self._mapped = faiss_io.read_index(self.index_path, mmap=self.mmap)
+        return index
 
     def save_index(self):
+        if self._mapped:
+            # Still the untouched on-disk index; rewriting the file it is mapped from is unsafe
+            return
         if self.index:
-            self.faiss.write_index(self.index, self.index_path)
+            self.faiss.write_index(faiss_io.to_cpu(self._gpu_res, self.index), self.index_path)
+            # Object dtype keeps user ids' types (7 stays an int) across a reload
+            ids = self.np.empty(len(self._ids), dtype=object)
+            ids[:] = self._ids
+            self.np.save(self.ids_path, ids, allow_pickle=True)
             with open(self.metadata_path, 'wb') as f:
-                self.pickle.dump(self.metadata_store, f)
+                self.pickle.dump(self._meta, f, protocol=self.pickle.HIGHEST_PROTOCOL)
+            self._dirty = 0
             logger.info(f"Saved FAISS index to {self.index_path}")
 
+    def flush(self):
+        """Save to disk if anything was inserted since the last save."""
+        if self._dirty:
+            self.save_index()
+
+    def close(self):
+        """Flush pending inserts regardless of durability mode."""
+        self.flush()
+
+    def __del__(self):
+        # Best effort only: the interpreter may be shutting down
+        if getattr(self, "durability", "manual") == "manual" or not getattr(self, "_dirty", 0):
+            return
+        try:
+            self.save_index()
+        except Exception:
+            pass
+
+    @property
+    def metadata_store(self):
+        """{internal_id: metadata} view, kept for callers of the old dict attribute."""
+        return {i: meta for i, meta in enumerate(self._meta) if meta is not None}
+
+    def _ensure_writable(self):
+        if self._mapped:
+            # Mapped pages are read-only; continue on an in-memory copy. clone_index would
+            # still view the mapped codes, so round-trip through serialization instead
+            self.index = self.faiss.deserialize_index(self.faiss.serialize_index(self.index))
+            self._mapped = False
+
+    def _mark_dirty(self, n: int):
+        # Disk writes are amortized according to self.durability (see flush())
+        self._dirty += n
+        if self.durability == "always" or (self.durability == "batch" and self._dirty >= self._dirty_threshold):
+            self.flush()
+
+    @clears_query_cache
     def insert_vectors(self, vectors, metadata=None):
-        if not vectors:
+        if vectors is None or len(vectors) == 0:
             return
 
-        # Ensure vectors are numpy array
-        vectors_np = self.np.array(vectors).astype('float32')
-        
+        if not hasattr(vectors[0], "__len__"):
+            vectors = [vectors]  # a single vector
+        n = len(vectors)
+        tile_rows = max(1, self.tile_bytes // (4 * len(vectors[0])))
+        # Tiles go into the index one at a time, so check every row's width first:
+        # a ragged batch must not leave earlier tiles in the index without metadata
+        dim = self.index.d if self.index is not None else len(vectors[0])
+        if isinstance(vectors, self.np.ndarray):
+            ragged = vectors.ndim != 2 or vectors.shape[1] != dim
+        else:
+            ragged = any(len(v) != dim for v in vectors)
+        if ragged:
+            raise ValueError(f"Expected {n} vectors of dimension {dim}.")
+
+        self._ensure_writable()
+
         # Initialize index if not exists (dimension based on first insert)
         if self.index is None:
-            self.dimension = vectors_np.shape[1]
-            # IDMap needed to map custom IDs, otherwise just sequential
-            # For simplicity, we use IndexFlatL2
-            self.index = self.faiss.IndexFlatL2(self.dimension)
-            # If we want to support ID mapping properly, we'd need IndexIDMap
-            # self.index = self.faiss.IndexIDMap(self.index) 
-
-        # Add to FAISS
-        # Note: IndexFlatL2 adds sequentially. We need to track IDs manually if we don't use IndexIDMap with explicit IDs.
-        # Current logic: FAISS internal ID = current total + index in batch
-        start_id = self.index.ntotal
-        self.index.add(vectors_np)
-        
-        # Store metadata
-        for i, meta in enumerate(metadata or []):
-            internal_id = start_id + i
+            self.dimension = len(vectors[0])
+            if self.index_type == "ivf_pq" and self.dimension % self.m:
+                raise ValueError(f"ivf_pq needs a dimension divisible by m={self.m} (got {self.dimension}).")
+            # Trained variants start flat and are trained later (see _maybe_train)
+            spec = "Flat" if self._needs_training() else self._factory_spec()
+            self.index = self._to_device(
+                self.faiss.index_factory(self.dimension, self._id_spec(spec), self._faiss_metric())
+            )
+
+        # Add to FAISS with explicit ids: internal id = position in the metadata store,
+        # which stays stable when earlier rows are deleted
+        start_id = len(self._meta)
+        for i in range(0, n, tile_rows):
+            # C-contiguous float32 input slices are used as-is, lists are converted one tile at a time
+            tile = self._prepare(vectors[i:i + tile_rows])
+            self.index.add_with_ids(tile, self.np.arange(start_id + i, start_id + i + len(tile), dtype="int64"))
+        self._maybe_train()
+
+        # Store metadata; rows without metadata are padded so positions stay aligned
+        given = list(metadata or [])[:n]
+        for internal_id, meta in enumerate(given, start_id):
             # meta is dict, add user-friendly ID if not present
-            if "id" not in meta:
-                meta["id"] = f"id_{internal_id}"
-            self.metadata_store[internal_id] = meta
-
-        # self.save_index()  <-- Removed for performance (batch processing)
-        logger.info(f"Inserted {len(vectors)} vectors into FAISS (in-memory)")
+            meta.setdefault("id", f"id_{internal_id}")
+        ids = [meta["id"] for meta in given]
+        ids.extend(str(internal_id) for internal_id in range(start_id + len(given), start_id + n))
+        # One geometric list growth per batch instead of per-row appends
+        self._meta.extend(given)
+        self._meta.extend([{} for _ in range(n - len(given))])
+        self._ids.extend(ids)
+        self._index_ids(start_id)
+
+        self._mark_dirty(n)
+        logger.info(f"Inserted {n} vectors into FAISS (in-memory)")
+
+    def _faiss_metric(self):
+        return self.faiss.METRIC_L2 if self.metric == "l2" else self.faiss.METRIC_INNER_PRODUCT
+
+    def _prepare(self, vectors):
+        """float32 C-contiguous 2-D matrix; rows L2-normalized for cosine without touching the caller's array."""
+        vectors_np = self.np.ascontiguousarray(vectors, dtype=self.np.float32)
+        if vectors_np.ndim == 1:
+            vectors_np = vectors_np.reshape(1, -1)
+        if self.metric == "cosine":
+            if isinstance(vectors, self.np.ndarray) and self.np.shares_memory(vectors_np, vectors):
+                vectors_np = vectors_np.copy()
+            self.faiss.normalize_L2(vectors_np)
+        return vectors_np
+
+    def _to_similarity(self, raw):
+        """Map a FAISS distance matrix to reported scores, in place."""
+        if self.metric == "l2":
+            # L2 is unbounded; 1 / (1 + distance) is a common distance -> similarity mapping
+            raw += 1
+            self.np.reciprocal(raw, out=raw)
+        elif self.metric == "cosine":
+            raw += 1
+            raw *= 0.5
+        return raw
+
+    def _factory_spec(self) -> str:
+        codec = self.QUANTIZE[self.quantize]
+        return {
+            "flat": codec,
+            "ivf_flat": f"IVF{self.nlist},{codec}",
+            "ivf_sq8": f"IVF{self.nlist},SQ8",
+            "ivf_pq": f"IVF{self.nlist},PQ{self.m}x{self.nbits}",
+            "hnsw": f"HNSW{self.hnsw_m}",
+        }[self.index_type]
+
+    @staticmethod
+    def _id_spec(spec: str) -> str:
+        # IVF inverted lists keep explicit ids themselves; IndexIDMap2 around them
+        # would break remove_ids, which does not compact IVF storage
+        return spec if spec.startswith("IVF") else "IDMap2," + spec
+
+    def _needs_training(self) -> bool:
+        return self.index_type.startswith("ivf") or self.quantize == "int8"
+
+    def _maybe_train(self):
+        """Migrate the flat staging index to the configured index once enough vectors exist to train it."""
+        flat_types = (self.faiss.IndexFlat,) + ((self.faiss.GpuIndexFlat,) if hasattr(self.faiss, "GpuIndexFlat") else ())
+        if not self._needs_training() or self.faiss.try_extract_index_ivf(self.index) is not None:
+            return
+        inner = self.faiss.downcast_index(self.index.index)
+        if not isinstance(inner, flat_types):
+            return
+        ntotal = self.index.ntotal
+        if ntotal < self.train_size:
+            return
+        # Carry the explicit ids over so metadata positions remain valid
+        vectors = inner.reconstruct_n(0, ntotal)
+        ids = self.faiss.vector_to_array(self.index.id_map)
+        index = self.faiss.index_factory(self.dimension, self._id_spec(self._factory_spec()), self._faiss_metric())
+        index.train(vectors)
+        index.add_with_ids(vectors, ids)
+        self.index = self._to_device(index)
+        logger.info(f"Trained FAISS {self.index_type} index on {ntotal} vectors")
+
+    def add_numpy_bulk(self, arr2d, metadata=None):
+        """
+        Insert an (N, dim) matrix, e.g. one read from Parquet/Arrow, without
+        any per-row Python conversion. float32 C-contiguous input is not copied.
+        """
+        if getattr(arr2d, "ndim", None) != 2:
+            raise ValueError("add_numpy_bulk expects a 2-D (N, dim) array.")
+        self.insert_vectors(arr2d, metadata)
 
     def persist(self):
         """Explicitly save index to disk."""
         self.save_index()
 
+    @cached_search
     def search_vectors(self, query_vector, top_k=5):
         if not self.index:
             return []
+        return self.search_vectors_batch(query_vector, top_k)[0]
 
-        # Ensure query is numpy array 2D
-        query_np = self.np.array([query_vector]).astype('float32')
-        
-        distances, indices = self.index.search(query_np, top_k)
-        
-        results = []
-        # indices[0] is the list of nearest neighbor IDs for the first query
-        for i, idx in enumerate(indices[0]):
-            if idx == -1: continue # No enough results
-            
-            meta = self.metadata_store.get(idx, {})
-            score = float(distances[0][i]) # L2 distance (lower is better)
-            
-            # Normalize score for consistency implies 0-1 usually, but L2 is unbounded. 
-            # 1 / (1 + distance) is a common normalization for distance -> similarity
-            sim_score = 1 / (1 + score)
-
-            results.append({
-                "id": meta.get("id", str(idx)),
-                "score": sim_score,
-                "metadata": meta
-            })
-        
-        return results
-
+    def search_vectors_batch(self, queries, top_k=5):
+        """Search an (nq, dim) matrix of queries in one index call; returns one result list per query."""
+        if not self.index:
+            return [[] for _ in range(len(queries))]
+
+        queries_np = self._prepare(queries)
+        # GPU IVF indexes expose nprobe directly
+        ivf = self.faiss.try_extract_index_ivf(self.index) if self._gpu_res is None else self.index
+        if hasattr(ivf, "nprobe"):
+            ivf.nprobe = self.nprobe
+        distances, indices = self.index.search(queries_np, top_k)
+        # One numpy pass for scores; -1 (fewer than top_k vectors) is filtered below
+        scores = self._to_similarity(distances).tolist()
+        ids, metas = self._ids, self._meta
+        return [
+            [{"id": ids[idx], "score": score, "metadata": metas[idx]}
+             for idx, score in zip(row_idx, row_scores) if idx >= 0]
+            for row_idx, row_scores in zip(indices.tolist(), scores)
+        ]
+
+    def _index_ids(self, start: int):
+        """Add rows start..end of _ids to the id -> internal ids map; tombstones are skipped."""
+        for internal_id in range(start, len(self._ids)):
+            if self._meta[internal_id] is not None:
+                self._id_rows.setdefault(self._ids[internal_id], []).append(internal_id)
+
+    def _find(self, vector_id):
+        """Internal ids of the rows stored under `vector_id` (the id reported by search)."""
+        return self.np.array(self._id_rows.get(vector_id, []), dtype="int64")
+
+    def _remove(self, internal_ids):
+        if self.index_type == "hnsw":
+            raise ValueError("FAISS HNSW indexes do not support removing vectors.")
+        self._ensure_writable()
+        self.index.remove_ids(self.faiss.IDSelectorBatch(internal_ids))
+
+    @clears_query_cache
     def update_vector(self, vector_id, new_vector, metadata=None):
-        logger.warning("Update not fully supported in simple FAISS implementation yet.")
-        pass
+        """
+        Replace the vector (and metadata, if given) stored under `vector_id`.
+        Raises ValueError for index_type="hnsw", which FAISS cannot remove from.
+        """
+        internal_ids = self._find(vector_id)
+        if not len(internal_ids):
+            logger.warning(f"Vector ID not found in FAISS: {vector_id}")
+            return
+        self._remove(internal_ids)
+        # The first row keeps its slot; any duplicates stored under the same id are dropped
+        keep = int(internal_ids[0])
+        self.index.add_with_ids(self._prepare(new_vector), self.np.array([keep], dtype="int64"))
+        meta = dict(metadata) if metadata is not None else self._meta[keep]
+        meta["id"] = vector_id
+        self._meta[keep] = meta
+        for idx in internal_ids[1:].tolist():
+            self._meta[idx] = None
+            self._ids[idx] = ""
+        self._id_rows[vector_id] = [keep]
+        self._mark_dirty(1)
+        logger.info(f"Updated vector ID: {vector_id}")
 
+    @clears_query_cache
     def delete_vector(self, vector_id):
-        logger.warning("Delete not fully supported in simple FAISS implementation yet.")
-        pass
+        """
+        Remove every vector stored under `vector_id`.
+        Raises ValueError for index_type="hnsw", which FAISS cannot remove from.
+        """
+        internal_ids = self._find(vector_id)
+        if not len(internal_ids):
+            logger.warning(f"Vector ID not found in FAISS: {vector_id}")
+            return
+        self._remove(internal_ids)
+        # Tombstones keep later rows at their positions
+        for idx in internal_ids.tolist():
+            self._meta[idx] = None
+            self._ids[idx] = ""
+        del self._id_rows[vector_id]
+        self._mark_dirty(len(internal_ids))
+        logger.info(f"Deleted vector ID: {vector_id}")
 
 
 # =====================
 # Store Factory Utility
 # =====================
-def get_vector_store(store_type: str = "chroma", config: dict = None):
+def get_vector_store(store_type: str = "chroma", config: dict = None, shared: bool = True):
     """
     Factory method to select vector store.
     :param store_type: "chroma", "pinecone", or "faiss"
     :param config: dict with credentials or paths
+    :param shared: reuse the store (and its client connection / file lock)
+                   built earlier for the same type and config. Configs with
+                   unhashable values are always built fresh.
     """
     config = config or {}
     store_type = store_type.lower()
-    
+
+    if shared:
+        config_key = tuple(sorted(config.items()))
+        try:
+            hash(config_key)
+        except TypeError:  # unhashable config value (list, dict, ...)
+            return _create_store(store_type, config)
+        return _build_store(store_type, config_key)
+    return _create_store(store_type, config)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_store(store_type: str, config_key: tuple):
+    return _create_store(store_type, dict(config_key))
+
+
+def _create_store(store_type: str, config: dict):
     if store_type == "pinecone":
         return PineconeVectorStore(
             api_key=config.get("api_key"),
@@ -280,7 +634,25 @@ def get_vector_store(store_type: str = "chroma", config: dict = None):
         )
     elif store_type == "faiss":
         return FaissVectorStore(
-            index_path=config.get("index_path", "data/faiss_index")
+            index_path=config.get("index_path", "data/faiss_index"),
+            query_cache_size=config.get("query_cache_size", 0),
+            query_cache_threshold=config.get("query_cache_threshold"),
+            durability=config.get("durability", "batch"),
+            dirty_threshold=config.get("dirty_threshold", 10000),
+            index_type=config.get("index_type", "flat"),
+            nlist=config.get("nlist", 1024),
+            nprobe=config.get("nprobe", 16),
+            m=config.get("m", 16),
+            nbits=config.get("nbits", 8),
+            hnsw_m=config.get("hnsw_m", 32),
+            train_size=config.get("train_size"),
+            metric=config.get("metric", "l2"),
+            num_threads=config.get("num_threads"),
+            quantize=config.get("quantize", "none"),
+            mmap=config.get("mmap", False),
+            device=config.get("device", "cpu"),
+            gpu_id=config.get("gpu_id", 0),
+            tile_bytes=config.get("tile_bytes", 256 * 1024),
         )
     else:
         raise ValueError(f"Unsupported vector store type: {store_type}")
@@ -1,41 +1,99 @@
 import logging
+import threading
+import warnings
 import weaviate
 from weaviate.classes.init import Auth
 from weaviate.classes.config import Configure, Property, DataType
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from vectorDBpipe.utils.common import content_digest
 from vectorDBpipe.vectordb.base import BaseVectorDatabase
+from vectorDBpipe.vectordb.query_cache import QueryCache, cached_search, clears_query_cache
+import json
+import os
 import uuid
 
+try:
+    import orjson
+except ImportError:  # optional — stdlib json is used instead
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Connected clients shared across instances (keyed by a digest, never the raw key):
+# (mode, url, key fingerprint) → [client, refcount]
+_CLIENT_CACHE: Dict[Tuple[str, str, str], list] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def _dumps(obj) -> str:
+    if orjson is not None:
+        # NON_STR_KEYS keeps parity with json.dumps for int/float metadata keys
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj)
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _parse_meta(raw) -> Dict[str, Any]:
+    """Decode a `source_meta` property; missing or malformed values become {}."""
+    if not raw:
+        return {}
+    try:
+        return _loads(raw)
+    except ValueError:  # both json and orjson decode errors subclass ValueError
+        return {}
+
 class WeaviateDatabase(BaseVectorDatabase):
     """
     Vector Database implementation using Weaviate (v4 client).
     Supports both local persistence (Docker/Local) and Weaviate Cloud (WCD).
+
+    Instances pointing at the same endpoint share one connected client (and
+    its gRPC channel); it is closed when the last of them calls close(). Use
+    the instance as a context manager or call close() explicitly.
     """
 
     def __init__(self, collection_name: str, mode: str = "local", api_key: str = None, save_dir: str = None, **kwargs):
         # Weaviate collections must start with a capital letter
         self.collection_name = collection_name.capitalize()
-        
+        self._query_cache = QueryCache.from_options(kwargs)
+        self._client_key = None
+
+        url = kwargs.get("url")
+        if mode == "cloud" and (not url or not api_key):
+            raise ValueError("Both 'url' and 'api_key' are required for Weaviate Cloud mode.")
+        if mode not in ("local", "cloud"):
+            raise ValueError(f"Unknown mode '{mode}'. Choose 'local' or 'cloud'.")
+
+        key = (mode, url or "", content_digest(api_key, 8).hex() if api_key else "")
+        with _CLIENT_CACHE_LOCK:
+            entry = _CLIENT_CACHE.get(key)
+            if entry is None:
+                entry = _CLIENT_CACHE[key] = [self._connect(mode, url, api_key), 0]
+            entry[1] += 1
+        self._client_key = key
+        self.client = entry[0]
+
+        try:
+            self._ensure_collection()
+            self.collection = self.client.collections.get(self.collection_name)
+        except Exception:
+            self.close()
+            raise
+
+    @staticmethod
+    def _connect(mode: str, url: str, api_key: str):
         if mode == "local":
             logger.info("Connecting to Local Weaviate instance.")
             # Typically connects to localhost:8080 assuming a local docker container
-            self.client = weaviate.connect_to_local()
-        elif mode == "cloud":
-            url = kwargs.get("url")
-            if not url or not api_key:
-                raise ValueError("Both 'url' and 'api_key' are required for Weaviate Cloud mode.")
-            logger.info(f"Connecting to Weaviate Cloud at {url}")
-            self.client = weaviate.connect_to_wcs(
-                cluster_url=url,
-                auth_credentials=Auth.api_key(api_key),
-            )
-        else:
-            raise ValueError(f"Unknown mode '{mode}'. Choose 'local' or 'cloud'.")
-
-        self._ensure_collection()
-        self.collection = self.client.collections.get(self.collection_name)
+            return weaviate.connect_to_local()
+        logger.info(f"Connecting to Weaviate Cloud at {url}")
+        return weaviate.connect_to_wcs(
+            cluster_url=url,
+            auth_credentials=Auth.api_key(api_key),
+        )
 
     def _ensure_collection(self):
         if not self.client.collections.exists(self.collection_name):
@@ -48,49 +106,48 @@ class WeaviateDatabase(BaseVectorDatabase):
                 ],
             )
 
+    @clears_query_cache
     def add(self, embeddings: List[List[float]], documents: List[str], metadata: List[Dict[str, Any]], ids: List[str] = None):
-        import json
-        
+        n = len(embeddings)
+        if hasattr(embeddings, "tolist"):  # numpy matrix → plain floats in one C-level pass, not per row
+            embeddings = embeddings.tolist()
+        # Serialize everything up front so the batch loop only hands objects to the client
+        uuids = [uuid.UUID(x) for x in ids[:n]] if ids else []
+        # Random v4 UUIDs for the rest, from a single os.urandom call instead of one per uuid4()
+        raw = os.urandom(16 * (n - len(uuids)))
+        uuids += [uuid.UUID(bytes=raw[i:i + 16], version=4) for i in range(0, len(raw), 16)]
+        source_metas = [_dumps(metadata[i] if metadata and len(metadata) > i else {}) for i in range(n)]  # Flatten metadata
+
         with self.collection.batch.dynamic() as batch:
-            for i in range(len(embeddings)):
-                custom_id = uuid.UUID(ids[i]) if ids and len(ids) > i else uuid.uuid4()
-                meta = metadata[i] if metadata and len(metadata) > i else {}
-                
+            for doc, vector, source_meta, custom_id in zip(documents, embeddings, source_metas, uuids):
                 batch.add_object(
-                    properties={
-                        "text": documents[i],
-                        "source_meta": json.dumps(meta) # Flatten metadata
-                    },
-                    vector=embeddings[i],
+                    properties={"text": doc, "source_meta": source_meta},
+                    vector=vector,
                     uuid=custom_id
                 )
-                
-        logger.info(f"Added {len(embeddings)} vectors to Weaviate collection {self.collection_name}.")
 
+        logger.info(f"Added {n} vectors to Weaviate collection {self.collection_name}.")
+
+    @cached_search
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
-        import json
         results = self.collection.query.near_vector(
             near_vector=query_embedding,
             limit=top_k,
             return_metadata=weaviate.classes.query.MetadataQuery(distance=True)
         )
         
-        formatted_results = []
-        for obj in results.objects:
-            meta_dict = {}
-            if "source_meta" in obj.properties:
-                try:
-                    meta_dict = json.loads(obj.properties["source_meta"])
-                except Exception:
-                    pass
-                    
-            formatted_results.append({
+        objects = results.objects
+        properties = [obj.properties for obj in objects]
+        metas = [_parse_meta(props.get("source_meta")) for props in properties]
+        return [
+            {
                 "id": str(obj.uuid),
-                "document": obj.properties.get("text"),
+                "document": props.get("text"),
                 "metadata": meta_dict,
                 "score": obj.metadata.distance
-            })
-        return formatted_results
+            }
+            for obj, props, meta_dict in zip(objects, properties, metas)
+        ]
 
     def get_collection_info(self) -> Dict[str, Any]:
         count_result = self.collection.aggregate.over_all(total_count=True)
@@ -100,9 +157,29 @@ class WeaviateDatabase(BaseVectorDatabase):
             "provider": "weaviate"
         }
 
+    def close(self):
+        """Release this instance's share of the client; the last one closes the connection."""
+        key, self._client_key = self._client_key, None
+        if key is None:
+            return
+        with _CLIENT_CACHE_LOCK:
+            entry = _CLIENT_CACHE.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del _CLIENT_CACHE[key]
+        entry[0].close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def __del__(self):
-        # Weaviate client requires closing
-        try:
-            self.client.close()
-        except:
-            pass
+        # Safety net only: finalizer timing is not deterministic, call close() instead
+        if getattr(self, "_client_key", None) is not None:
+            warnings.warn(f"WeaviateDatabase({self.collection_name!r}) was not closed", ResourceWarning, stacklevel=2)
+            self.close()